@@ -1,19 +1,1086 @@
 # import modules
 import sys
+import os
 import re
-from datetime import datetime
+import mmap
+import struct
+import time
+import bisect
+import threading
+import csv
+import json
+import io
+import contextlib
+from collections.abc import Mapping
+from datetime import datetime, date
 import random
+try:
+    import numpy as np
+except ImportError: # the points forecaster falls back to a pure Python simulation
+    np = None
+
+BANK_REGEX = r'^[A-Za-z]{1,5}$'
+ACCOUNT_REGEX = r'^\d{1,14}$'
+GIFT_CARD_REGEX = r'^[0-9]{8}$'
+BANK_PATTERN = re.compile(BANK_REGEX)
+ACCOUNT_PATTERN = re.compile(ACCOUNT_REGEX)
+GIFT_CARD_PATTERN = re.compile(GIFT_CARD_REGEX)
+DATE_FORMAT = '%Y-%m-%d'
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def format_time(time_ns: int, time_format: str = DATETIME_FORMAT) -> str:
+    """
+    Formats an epoch timestamp in nanoseconds as local time. Only called when a record is rendered.
+    """
+    return datetime.fromtimestamp(time_ns / 1e9).strftime(time_format)
+
+
+def to_time_ns(moment: datetime) -> int:
+    """
+    Converts a datetime to an epoch timestamp in nanoseconds.
+    """
+    return int(moment.timestamp() * 1e9)
+
+
+class Ledger:
+    """
+    A durable, append-only history of charges, transfers, payments and activities.
+
+    Records are fixed-size binary rows in `path`, comments and activity texts live in `path.text`,
+    and each record type has its own index file (`path.<kind>.idx`) with the row numbers of that type.
+    Reads go through mmap, so opening a ledger does not read it, and because timestamps only grow,
+    a date range is found by binary search. A page of history costs O(log n + page size).
+    """
+    KINDS = ('charge', 'transfer', 'pay', 'activity')
+    RECORD = struct.Struct('<qqqqQIB3x') # time_ns, amount, balance, points, text offset, text length, kind
+    INDEX = struct.Struct('<Q') # row number
+
+    def __init__(self, path: str, sync: bool = False):
+        """
+        Opens (or creates) the ledger at `path`.
+
+        Parameters:
+        path (str): The path of the record file.
+        sync (bool, optional): If True, every append is fsync-ed to disk. Default is False (flush only).
+        """
+        self.path = path
+        self.sync = sync
+        self._records = open(path, 'ab+')
+        self._text = open(path + '.text', 'ab+')
+        self._indexes = {kind: open(f"{path}.{kind}.idx", 'ab+') for kind in self.KINDS}
+        self._maps = {}
+        self._recover()
+        last = self.record(self._count - 1) if self._count else None
+        self._last_time_ns = last['time_ns'] if last else 0
+
+    @staticmethod
+    def _whole_rows(f, row_size: int) -> int:
+        # cuts a torn row left by a crash in the middle of a write and returns the number of whole rows
+        rows = os.fstat(f.fileno()).st_size // row_size
+        f.truncate(rows * row_size)
+        return rows
+
+    def _recover(self):
+        # An append writes the text, then the record, then the index row, so a crash can leave torn rows,
+        # index rows past the last record, a last record missing from its index, or text no record points to.
+        # Everything after the last whole record is cut and the indexes are brought in line with the records.
+        self._count = self._whole_rows(self._records, self.RECORD.size)
+        self._index_counts = {}
+        indexed = -1 # the last row found in any index
+        for kind, f in self._indexes.items():
+            count = self._whole_rows(f, self.INDEX.size)
+            while count and self.INDEX.unpack(os.pread(f.fileno(), self.INDEX.size, (count - 1) * self.INDEX.size))[0] >= self._count:
+                count -= 1
+            f.truncate(count * self.INDEX.size)
+            self._index_counts[kind] = count
+            if count:
+                indexed = max(indexed, self.INDEX.unpack(os.pread(f.fileno(), self.INDEX.size, (count - 1) * self.INDEX.size))[0])
+        text_end = 0
+        for row in range(max(min(indexed + 1, self._count - 1), 0), self._count): # the last record gives the text end
+            _, _, _, _, offset, length, kind = self.RECORD.unpack(os.pread(self._records.fileno(), self.RECORD.size, row * self.RECORD.size))
+            text_end = offset + length
+            if row > indexed:
+                self._indexes[self.KINDS[kind]].write(self.INDEX.pack(row))
+                self._index_counts[self.KINDS[kind]] += 1
+        self._text.truncate(text_end)
+        self._text_size = text_end
+        for f in (self._records, self._text, *self._indexes.values()):
+            f.flush()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self):
+        for view in self._maps.values():
+            view[1].close()
+        self._maps.clear()
+        for f in [self._records, self._text, *self._indexes.values()]:
+            f.close()
+
+    def append(self, kind: str, amount: int, balance: int, points: int, text: str = '', time_ns: int = None) -> int:
+        """
+        Appends a record and returns its row number.
+        """
+        if time_ns is None:
+            time_ns = time.time_ns()
+        time_ns = max(time_ns, self._last_time_ns) # keep the file sorted by time even if the clock goes back
+        encoded = text.encode('utf-8')
+        self._text.write(encoded)
+        self._records.write(self.RECORD.pack(time_ns, amount, balance, points, self._text_size, len(encoded), self.KINDS.index(kind)))
+        self._indexes[kind].write(self.INDEX.pack(self._count))
+        for f in (self._text, self._records, self._indexes[kind]):
+            f.flush()
+            if self.sync:
+                os.fsync(f.fileno())
+        self._text_size += len(encoded)
+        self._last_time_ns = time_ns
+        self._index_counts[kind] += 1
+        self._count += 1
+        return self._count - 1
+
+    def _view(self, f) -> mmap.mmap:
+        # (re)map a file when it has grown since the last read
+        size = os.fstat(f.fileno()).st_size
+        cached = self._maps.get(f.name)
+        if cached is None or cached[0] < size:
+            if cached is not None:
+                cached[1].close()
+            if size == 0:
+                return b''
+            cached = self._maps[f.name] = (size, mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ))
+        return cached[1]
+
+    def _time_ns(self, row: int) -> int:
+        return self.RECORD.unpack_from(self._view(self._records), row * self.RECORD.size)[0]
+
+    def _row(self, kind: str, position: int) -> int:
+        if kind is None:
+            return position
+        return self.INDEX.unpack_from(self._view(self._indexes[kind]), position * self.INDEX.size)[0]
+
+    def record(self, row: int) -> dict:
+        """
+        Returns the record at a row number as a dictionary shaped like the wallet's in-memory records
+        ('action' for activities, 'amount' and 'comment' for transactions).
+        """
+        time_ns, amount, balance, points, offset, length, kind = self.RECORD.unpack_from(self._view(self._records), row * self.RECORD.size)
+        text = self._view(self._text)[offset:offset + length].decode('utf-8') if length else ''
+        kind = self.KINDS[kind]
+        if kind == 'activity':
+            return {'kind': kind, 'time_ns': time_ns, 'action': text, 'balance': balance, 'points': points}
+        return {'kind': kind, 'time_ns': time_ns, 'amount': amount, 'balance': balance, 'points': points, 'comment': text}
+
+    def last(self) -> dict:
+        """
+        Returns the most recent record, or None if the ledger is empty.
+        """
+        return self.record(self._count - 1) if self._count else None
+
+    def _span(self, kind: str = None, start: datetime = None, end: datetime = None) -> range:
+        # positions (in the kind index, or rows if kind is None) whose time is in [start, end)
+        size = self._index_counts[kind] if kind else self._count
+        key = lambda position: self._time_ns(self._row(kind, position))
+        positions = range(size)
+        lo = bisect.bisect_left(positions, to_time_ns(start), key=key) if start else 0
+        hi = bisect.bisect_left(positions, to_time_ns(end), key=key) if end else size
+        return range(lo, max(lo, hi))
+
+    def count(self, kind: str = None, start: datetime = None, end: datetime = None) -> int:
+        """
+        Returns the number of records of a kind (all kinds if None) between `start` (inclusive) and `end` (exclusive).
+        """
+        return len(self._span(kind, start, end))
+
+    def query(self, kind: str = None, start: datetime = None, end: datetime = None, page: int = 1, page_size: int = 20) -> list:
+        """
+        Returns one page of records, oldest first.
+
+        Parameters:
+        kind (str, optional): "charge", "transfer", "pay" or "activity". None for all kinds.
+        start, end (datetime, optional): The time range, start inclusive and end exclusive.
+        page (int, optional): The 1-based page number. Default is 1.
+        page_size (int, optional): The number of records per page. Default is 20.
+
+        Returns:
+        list: The records of the page as dictionaries (see `record`).
+        """
+        span = self._span(kind, start, end)[(page - 1) * page_size:page * page_size]
+        return [self.record(self._row(kind, position)) for position in span]
+
+    def records(self, kind: str = None, start: datetime = None, end: datetime = None):
+        """
+        Yields the records of a kind between `start` and `end` without loading them all at once.
+        """
+        for position in self._span(kind, start, end):
+            yield self.record(self._row(kind, position))
+
+
+class AccountRegistry(Mapping):
+    """
+    The registered bank accounts by name ("1", "2", ...), indexed by account number and by bank.
+
+    It reads like the dictionary it replaces ({name: {'bank', 'number', 'balance'}}),
+    but duplicate checks and lookups by number or bank are O(1).
+    """
+    def __init__(self):
+        self._accounts = {}
+        self._by_number = {}
+        self._by_bank = {}
+
+    def __getitem__(self, name: str) -> dict:
+        return self._accounts[name]
+
+    def __iter__(self):
+        return iter(self._accounts)
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def add(self, bank: str, number: str, balance: int) -> str:
+        """
+        Adds an account and returns its name.
+
+        Raises:
+        ValueError: If the account number is already registered.
+        """
+        if number in self._by_number:
+            raise ValueError("This account is already registered. Please enter a different account number.")
+        name = str(len(self._accounts) + 1)
+        self._accounts[name] = {'bank': bank, 'number': number, 'balance': balance}
+        self._by_number[number] = name
+        self._by_bank.setdefault(bank, []).append(name)
+        return name
+
+    def by_number(self, number: str) -> str:
+        """
+        Returns the name of the account with this number, or None.
+        """
+        return self._by_number.get(number)
+
+    def by_bank(self, bank: str) -> list:
+        """
+        Returns the names of the accounts at this bank.
+        """
+        return list(self._by_bank.get(bank, []))
+
+    def numbers(self) -> set:
+        """
+        Returns the registered account numbers.
+        """
+        return set(self._by_number)
+
+
+class ReceiverRegistry(Mapping):
+    """
+    The saved receivers by nickname ({nickname: {'name', 'bank', 'number'}}), indexed by (bank, account number).
+    """
+    def __init__(self):
+        self._receivers = {}
+        self._by_account = {}
+
+    def __getitem__(self, nickname: str) -> dict:
+        return self._receivers[nickname]
+
+    def __iter__(self):
+        return iter(self._receivers)
+
+    def __len__(self) -> int:
+        return len(self._receivers)
+
+    def save(self, nickname: str, name: str, bank: str, number: str):
+        """
+        Saves a receiver, replacing any receiver saved under the same nickname.
+        """
+        old = self._receivers.get(nickname)
+        if old is not None:
+            self._by_account[(old['bank'], old['number'])].discard(nickname)
+        self._receivers[nickname] = {'name': name, 'bank': bank, 'number': number}
+        self._by_account.setdefault((bank, number), set()).add(nickname)
+
+    def by_account(self, bank: str, number: str) -> list:
+        """
+        Returns the nicknames saved for this bank and account number.
+        """
+        return sorted(self._by_account.get((bank, number), ()))
+
+
+LATENCY_BUCKETS_NS = (1000, 2000, 5000, 10000, 20000, 50000, 100000, 250000, 500000, 1000000, 5000000)
+
+
+class MemorySink:
+    """
+    Keeps every flushed metrics snapshot in `snapshots`.
+    """
+    def __init__(self):
+        self.snapshots = []
+
+    def write(self, snapshot: dict):
+        self.snapshots.append(snapshot)
+
+
+class JsonlSink:
+    """
+    Appends one JSON line per flushed snapshot to the file at `path`.
+    """
+    def __init__(self, path: str):
+        self.path = path
+
+    def write(self, snapshot: dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(snapshot) + '\n')
+
+
+class PrometheusSink:
+    """
+    Rewrites the file at `path` in the Prometheus text format on every flush (for a textfile collector).
+    """
+    def __init__(self, path: str, prefix: str = 'naverpay'):
+        self.path = path
+        self.prefix = prefix
+
+    def write(self, snapshot: dict):
+        lines = [f"# TYPE {self.prefix}_branch_total counter"]
+        lines.extend(f'{self.prefix}_branch_total{{branch="{name}"}} {count}' for name, count in sorted(snapshot['counters'].items()))
+        lines.append(f"# TYPE {self.prefix}_latency_seconds histogram")
+        for name, histogram in sorted(snapshot['histograms'].items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS_NS, histogram['buckets']):
+                cumulative += count
+                lines.append(f'{self.prefix}_latency_seconds_bucket{{branch="{name}",le="{bound / 1e9:g}"}} {cumulative}')
+            lines.append(f'{self.prefix}_latency_seconds_bucket{{branch="{name}",le="+Inf"}} {histogram["count"]}')
+            lines.append(f'{self.prefix}_latency_seconds_sum{{branch="{name}"}} {histogram["sum_ns"] / 1e9:g}')
+            lines.append(f'{self.prefix}_latency_seconds_count{{branch="{name}"}} {histogram["count"]}')
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(temp_path, self.path) # readers never see a half-written file
+
+
+class Metrics:
+    """
+    Per-branch counters and latency histograms for the wallet operations.
+
+    Disabled by default: the operations then only check `enabled` once, so the hooks can stay in production
+    and be switched on with `enable()` when latency spikes.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.sinks = []
+        self._lock = threading.Lock() # the operations may be called from more than one thread
+        self.reset()
+
+    def enable(self, *sinks):
+        """
+        Turns the instrumentation on and adds sinks (MemorySink, JsonlSink, PrometheusSink) for `flush()`.
+        """
+        self.sinks.extend(sinks)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self._buckets = {}
+            self._sums = {}
+
+    def count(self, branch: str):
+        """
+        Counts one pass through `branch` without timing it.
+        """
+        with self._lock:
+            self.counters[branch] = self.counters.get(branch, 0) + 1
+
+    def record(self, branch: str, elapsed_ns: int):
+        """
+        Counts one pass through `branch` and adds its latency to the branch histogram.
+        """
+        with self._lock:
+            self.counters[branch] = self.counters.get(branch, 0) + 1
+            buckets = self._buckets.get(branch)
+            if buckets is None:
+                buckets = self._buckets[branch] = [0] * (len(LATENCY_BUCKETS_NS) + 1)
+                self._sums[branch] = 0
+            buckets[bisect.bisect_left(LATENCY_BUCKETS_NS, elapsed_ns)] += 1
+            self._sums[branch] += elapsed_ns
+
+    def snapshot(self) -> dict:
+        """
+        Returns the counters and histograms (bucket counts per LATENCY_BUCKETS_NS bound, count and sum) so far.
+        """
+        with self._lock:
+            return {'time': time.time(), 'counters': dict(self.counters),
+                    'histograms': {name: {'buckets': buckets[:-1], 'count': sum(buckets), 'sum_ns': self._sums[name]}
+                                   for name, buckets in self._buckets.items()}}
+
+    def flush(self) -> dict:
+        """
+        Writes a snapshot to every sink and returns it.
+        """
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            sink.write(snapshot)
+        return snapshot
+
+
+metrics = Metrics()
+
+
+class Wallet:
+    """
+    A headless Naver Pay wallet that holds the balance, points, accounts and history.
+
+    Every operation is non-interactive: invalid requests raise ValueError with the same
+    message the CLI prints, so the wallet can be driven from a service or a batch job.
+    The interactive menus below are a thin layer over the module-level `wallet`.
+    """
+    INITIAL_ACCOUNT_BALANCE = 100000
+    CHARGE_UNIT = 1000
+    POINT_RATE = 0.05
+    BONUS_TIERS = ((90, 100), (99, 2000), (100, 5000)) # (highest roll of randint(1, 100), bonus points)
+
+    def __init__(self, balance: int = 0, points: int = 0, ledger: Ledger = None):
+        self.balance = balance
+        self.points = points
+        self.ledger = ledger
+        self.accounts = AccountRegistry()
+        self.receiver_saved = ReceiverRegistry()
+        self.gift_cards = {}
+        self.activity_log = []
+        self.charge_comment = []
+        self.transfer_comment = []
+        self.pay_comment = []
+        self._snapshot = None # (path, sequence, base created_ns, history lengths) of the last snapshot or checkpoint
+
+    @classmethod
+    def open(cls, path: str) -> 'Wallet':
+        """
+        Opens a wallet backed by the ledger at `path`, restoring the balance and points from its last record.
+        """
+        ledger = Ledger(path)
+        last = ledger.last()
+        if last is None:
+            return cls(ledger=ledger)
+        return cls(last['balance'], last['points'], ledger)
+
+    def save_snapshot(self, path: str) -> int:
+        """
+        Writes a full snapshot of the wallet to `path` and starts a new checkpoint chain on it.
+
+        Returns:
+        int: The number of history records written.
+        """
+        created_ns = WalletSnapshot.write(path, self)
+        index = 1
+        while os.path.exists(f"{path}.{index}"): # checkpoints of the previous snapshot
+            os.remove(f"{path}.{index}")
+            index += 1
+        self._snapshot = (path, 0, created_ns, self._history_lengths())
+        return sum(self._snapshot[3])
+
+    def checkpoint(self) -> int:
+        """
+        Writes the balances and registries plus only the history appended since the last snapshot or checkpoint
+        to the next checkpoint file (`path.1`, `path.2`, ...). Without a snapshot yet, raises ValueError.
+
+        Returns:
+        int: The number of history records written.
+        """
+        if self._snapshot is None:
+            raise ValueError("Save a snapshot before writing a checkpoint.")
+        path, sequence, base_ns, since = self._snapshot
+        WalletSnapshot.write(f"{path}.{sequence + 1}", self, WalletSnapshot.DELTA, sequence + 1, base_ns, since)
+        self._snapshot = (path, sequence + 1, base_ns, self._history_lengths())
+        return sum(self._snapshot[3]) - sum(since)
+
+    @classmethod
+    def restore(cls, path: str, ledger: Ledger = None) -> 'Wallet':
+        """
+        Rebuilds a wallet from the snapshot at `path` and its checkpoints, so later checkpoints continue the chain.
+        """
+        restored = cls(ledger=ledger)
+        base = WalletSnapshot.read(path)
+        restored._apply_snapshot(base)
+        sequence = 0
+        while os.path.exists(f"{path}.{sequence + 1}"):
+            delta = WalletSnapshot.read(f"{path}.{sequence + 1}")
+            if delta['kind'] != WalletSnapshot.DELTA or delta['sequence'] != sequence + 1 or delta['base_ns'] != base['created_ns']:
+                break # left over from an older snapshot
+            restored._apply_snapshot(delta)
+            sequence += 1
+        restored._snapshot = (path, sequence, base['created_ns'], restored._history_lengths())
+        return restored
+
+    def _history_lengths(self) -> tuple:
+        return tuple(len(self._history(kind)) for kind in WalletSnapshot.HISTORIES)
+
+    def _history(self, kind: str) -> list:
+        return self.activity_log if kind == 'activity' else self.comment_list(kind)
+
+    def _apply_snapshot(self, snapshot: dict):
+        self.balance = snapshot['balance']
+        self.points = snapshot['points']
+        state = snapshot['state']
+        self.accounts = AccountRegistry()
+        for account in state['accounts']:
+            self.accounts.add(account['bank'], account['number'], account['balance'])
+        self.receiver_saved = ReceiverRegistry()
+        for nickname, receiver in state['receivers'].items():
+            self.receiver_saved.save(nickname, receiver['name'], receiver['bank'], receiver['number'])
+        self.gift_cards = dict(state['gift_cards'])
+        for kind, rows in snapshot['history'].items():
+            self._history(kind).extend(rows)
+
+    def comment_list(self, action: str) -> list:
+        """
+        Returns the comment history for an action type ("charge", "transfer" or "pay").
+        """
+        return {'charge': self.charge_comment, 'transfer': self.transfer_comment, 'pay': self.pay_comment}[action]
+
+    def log_activity(self, action: str):
+        """
+        Logs an activity with the current balance and points.
+        """
+        current_time = time.time_ns()
+        if self.activity_log:
+            current_time = max(current_time, self.activity_log[-1]['time_ns']) # keep the log sorted by time even if the clock goes back
+        self.activity_log.append({'time_ns': current_time, 'action': action, 'balance': self.balance, 'points': self.points})
+        if self.ledger is not None:
+            self.ledger.append('activity', 0, self.balance, self.points, action, current_time)
+
+    def log_transaction(self, action: str, amount: int, comment_str: str):
+        """
+        Logs a charge, transfer or payment in its comment history with the current balance.
+        """
+        comment_list = self.comment_list(action)
+        log_transaction(amount, comment_str, comment_list, self.balance)
+        if self.ledger is not None:
+            self.ledger.append(action, amount, self.balance, self.points, comment_str, comment_list[-1]['time_ns'])
+
+    def history(self, action: str, start: datetime = None, end: datetime = None) -> list:
+        """
+        Returns the records of an action type ("charge", "transfer", "pay" or "activity") between `start`
+        (inclusive) and `end` (exclusive). Records are kept in time order, so the range is found by binary search.
+        When a ledger is attached, the full history on disk is searched instead of this session's records.
+        """
+        if self.ledger is not None:
+            return list(self.ledger.records(action, start, end))
+        records = self.activity_log if action == 'activity' else self.comment_list(action)
+        key = lambda record: record['time_ns']
+        lo = bisect.bisect_left(records, to_time_ns(start), key=key) if start else 0
+        hi = bisect.bisect_left(records, to_time_ns(end), key=key) if end else len(records)
+        return records[lo:hi]
+
+    def daily_summary(self, start: datetime = None, end: datetime = None) -> dict:
+        """
+        Totals the money charged, sent and paid per (local) day.
+
+        Returns:
+        dict: {date: {'charged': int, 'sent': int, 'paid': int}} in date order.
+        """
+        summary = {}
+        for action, column in (('charge', 'charged'), ('transfer', 'sent'), ('pay', 'paid')):
+            for record in self.history(action, start, end):
+                day = date.fromtimestamp(record['time_ns'] / 1e9)
+                if day not in summary:
+                    summary[day] = {'charged': 0, 'sent': 0, 'paid': 0}
+                summary[day][column] += record['amount']
+        return dict(sorted(summary.items()))
+
+    def export_csv(self, path: str, action: str, start: datetime = None, end: datetime = None):
+        """
+        Writes the history of an action type to a CSV file, formatting the timestamps as it goes.
+        """
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if action == 'activity':
+                writer.writerow(['date', 'action', 'balance', 'points'])
+                for record in self.history(action, start, end):
+                    writer.writerow([format_time(record['time_ns']), record['action'], record['balance'], record['points']])
+            else:
+                writer.writerow(['date', 'amount', 'balance', 'comment'])
+                for record in self.history(action, start, end):
+                    writer.writerow([format_time(record['time_ns']), record['amount'], record['balance'], record['comment']])
+
+    def min_charge(self, amount: int) -> int:
+        """
+        Returns the smallest multiple of 1000 that covers the shortfall for `amount`.
+        """
+        return (amount - self.balance + self.CHARGE_UNIT - 1) // self.CHARGE_UNIT * self.CHARGE_UNIT
+
+    @staticmethod
+    def _check_amount(amount: int):
+        if not isinstance(amount, int) or amount <= 0:
+            raise ValueError("Invalid input. You must enter a value larger than 0.")
+
+    def register_account(self, bank: str, number: str, initial_balance: int = None) -> str:
+        """
+        Registers a bank account and returns its name (the next number as a string).
+
+        Raises:
+        ValueError: If the bank or account number is invalid or the account is already registered.
+        """
+        if not BANK_PATTERN.match(bank) or not ACCOUNT_PATTERN.match(number):
+            raise ValueError("Invalid input. Please enter a valid value.")
+        balance = self.INITIAL_ACCOUNT_BALANCE if initial_balance is None else initial_balance
+        return self.accounts.add(bank, number, balance)
+
+    def import_accounts(self, rows) -> dict:
+        """
+        Registers many accounts in one pass.
+
+        Parameters:
+        rows (iterable): Dictionaries with 'bank', 'number' and optionally 'balance'.
+
+        Returns:
+        dict: The number of imported accounts and a list of (row index, error message) for skipped rows.
+        Rows with an invalid bank, number or balance (not a whole number larger than 0), or a number that is
+        already registered (or repeated in `rows`), are skipped.
+        """
+        seen = self.accounts.numbers()
+        imported = 0
+        errors = []
+        for index, row in enumerate(rows):
+            bank, number = (row.get('bank') or '').strip(), (row.get('number') or '').strip()
+            if not BANK_PATTERN.match(bank) or not ACCOUNT_PATTERN.match(number):
+                errors.append((index, "Invalid input. Please enter a valid value."))
+                continue
+            if number in seen:
+                errors.append((index, "This account is already registered. Please enter a different account number."))
+                continue
+            try:
+                balance = int(row['balance']) if row.get('balance') not in (None, '') else self.INITIAL_ACCOUNT_BALANCE
+            except ValueError:
+                errors.append((index, "Invalid input. Please enter a valid value."))
+                continue
+            if balance <= 0:
+                errors.append((index, "Invalid input. You must enter a value larger than 0."))
+                continue
+            seen.add(number)
+            self.accounts.add(bank, number, balance)
+            imported += 1
+        return {'imported': imported, 'errors': errors}
+
+    def import_accounts_csv(self, path: str) -> dict:
+        """
+        Registers the accounts in a CSV file with a header row (bank, number[, balance]). See `import_accounts`.
+        """
+        with open(path, newline='', encoding='utf-8') as f:
+            return self.import_accounts(csv.DictReader(f))
+
+    def charge(self, amount: int, account_name: str, comment: str = ''):
+        """
+        Moves `amount` from a registered account to the Naver Pay balance.
+
+        Parameters:
+        amount (int): The amount to charge.
+        account_name (str): The name of the registered account to charge from.
+        comment (str, optional): The comment to log. If None, no transaction is logged and the caller logs it later.
+        """
+        started = time.perf_counter_ns() if metrics.enabled else 0
+        self._check_amount(amount)
+        if account_name not in self.accounts:
+            raise ValueError("Invalid input. Please enter a valid option.")
+        selected_account = self.accounts[account_name]
+        if selected_account['balance'] < amount:
+            raise ValueError("Insufficient account balance.")
+        selected_account['balance'] -= amount
+        self.balance += amount
+        self.log_activity(f"Account charge: {amount}₩")
+        if comment is not None:
+            self.log_transaction('charge', amount, comment)
+        if started:
+            metrics.record('charge', time.perf_counter_ns() - started)
+
+    def _cover(self, amount: int, account_name: str = None) -> bool:
+        # automatic charge of the minimum amount when the balance is short; True if it charged
+        if self.balance >= amount:
+            return False
+        if account_name is None:
+            raise ValueError("Insufficient balance.")
+        self.charge(self.min_charge(amount), account_name)
+        return True
+
+    def save_receiver(self, nickname: str, name: str, bank: str, number: str):
+        """
+        Saves a receiver under a nickname.
+        """
+        if not BANK_PATTERN.match(bank) or not ACCOUNT_PATTERN.match(number):
+            raise ValueError("Invalid input. Please enter a valid value.")
+        self.receiver_saved.save(nickname, name, bank, number)
+
+    def transfer(self, amount: int, receiver_name: str, receiver_bank: str, receiver_account: str, account_name: str = None, comment: str = ''):
+        """
+        Sends money to a receiver, charging the minimum amount from `account_name` first if the balance is short.
+        """
+        started = time.perf_counter_ns() if metrics.enabled else 0
+        self._check_amount(amount)
+        if not BANK_PATTERN.match(receiver_bank) or not ACCOUNT_PATTERN.match(receiver_account):
+            raise ValueError("Invalid input. Please enter a valid value.")
+        charged = self._cover(amount, account_name)
+        self.balance -= amount
+        self.log_activity(f"Transfer: {amount}")
+        if comment is not None:
+            self.log_transaction('transfer', amount, comment)
+        if started:
+            metrics.record('transfer_auto_charge' if charged else 'transfer', time.perf_counter_ns() - started)
+
+    def earn_points(self, amount: int) -> int:
+        """
+        Returns the points earned for a payment of `amount`.
+        """
+        return int(amount * self.POINT_RATE)
+
+    def pay(self, amount: int, account_name: str = None, comment: str = '', rng=random) -> dict:
+        """
+        Makes a payment, earns points and draws the additional point bonus.
+
+        Returns:
+        dict: The earned points and the additional (bonus) points.
+        """
+        started = time.perf_counter_ns() if metrics.enabled else 0
+        self._check_amount(amount)
+        earned_points = self.earn_points(amount)
+        charged = self._cover(amount, account_name)
+        self.balance -= amount
+        self.points += earned_points
+        self.log_activity(f"Payment: {amount}")
+        bonus = self.award_additional_points(rng)
+        self.log_activity(f"Additional points: {bonus}p") # recorded here so the ledger holds the post-bonus points even if the comment is never entered
+        if comment is not None:
+            self.log_transaction('pay', amount, comment)
+        if started:
+            metrics.record('pay_auto_charge' if charged else 'pay', time.perf_counter_ns() - started)
+            metrics.count(f'pay_bonus_{bonus}')
+        return {'earned': earned_points, 'bonus': bonus}
+
+    def award_additional_points(self, rng=random) -> int:
+        """
+        Awards additional points on a random chance and returns them.
+        """
+        chance = rng.randint(1, 100) # generate a random number between 1 and 100
+        additional_points = next(points for highest, points in self.BONUS_TIERS if chance <= highest)
+        self.points += additional_points
+        return additional_points
+
+    def register_gift_card(self, card_number: str, card_balance: int):
+        """
+        Registers a gift card.
+        """
+        if not GIFT_CARD_PATTERN.match(card_number):
+            raise ValueError("Invalid input. Please enter a valid value.")
+        self._check_amount(card_balance)
+        if card_number in self.gift_cards:
+            raise ValueError("This gift card is already registered.")
+        self.gift_cards[card_number] = card_balance
+        self.log_activity("Registered Gift Card")
+
+    def import_gift_cards(self, rows) -> dict:
+        """
+        Registers many gift cards in one pass and logs a single activity for them.
+
+        Parameters:
+        rows (iterable): Dictionaries with 'number' and 'balance'.
+
+        Returns:
+        dict: The number of imported gift cards and a list of (row index, error message) for skipped rows.
+        """
+        imported = {}
+        errors = []
+        for index, row in enumerate(rows):
+            number = (row.get('number') or '').strip()
+            try:
+                card_balance = int(row.get('balance') or 0)
+            except ValueError:
+                card_balance = 0
+            if not GIFT_CARD_PATTERN.match(number):
+                errors.append((index, "Invalid input. Please enter a valid value."))
+            elif card_balance <= 0:
+                errors.append((index, "Invalid input. You must enter a value larger than 0."))
+            elif number in self.gift_cards or number in imported:
+                errors.append((index, "This gift card is already registered."))
+            else:
+                imported[number] = card_balance
+        self.gift_cards.update(imported)
+        if imported:
+            self.log_activity(f"Registered {len(imported)} Gift Cards")
+        return {'imported': len(imported), 'errors': errors}
+
+    def import_gift_cards_csv(self, path: str) -> dict:
+        """
+        Registers the gift cards in a CSV file with a header row (number, balance). See `import_gift_cards`.
+        """
+        with open(path, newline='', encoding='utf-8') as f:
+            return self.import_gift_cards(csv.DictReader(f))
+
+    def convert_points(self, amount: int):
+        """
+        Converts points to balance one to one.
+        """
+        if self.points <= 0:
+            raise ValueError("You have no points to convert.")
+        self._check_amount(amount)
+        if amount > self.points:
+            raise ValueError("You don't have enough points to convert that amount.")
+        self.balance += amount
+        self.points -= amount
+        self.log_activity("Converted Points to Balance")
+
+    def apply_batch(self, transactions, rng=random) -> dict:
+        """
+        Validates and applies many transactions in one pass.
+
+        Parameters:
+        transactions (iterable): Dictionaries with a 'type' key and the arguments of the matching method:
+            - charge: amount, account, comment
+            - transfer: amount, name, bank, number, account (for the automatic charge), nickname, comment
+            - pay: amount, account (for the automatic charge), comment
+            - gift_card: number, balance
+            - convert: amount
+        rng (random.Random, optional): The random source for the payment bonus.
+
+        Returns:
+        dict: The number of applied transactions and a list of (index, error message) for rejected ones.
+        A rejected transaction does not change the wallet.
+        """
+        applied = 0
+        errors = []
+        for index, transaction in enumerate(transactions):
+            try:
+                kind = transaction['type']
+                if kind == 'charge':
+                    self.charge(transaction['amount'], transaction['account'], transaction.get('comment', ''))
+                elif kind == 'transfer':
+                    self.transfer(transaction['amount'], transaction['name'], transaction['bank'], transaction['number'],
+                                  transaction.get('account'), transaction.get('comment', ''))
+                    if transaction.get('nickname'):
+                        self.save_receiver(transaction['nickname'], transaction['name'], transaction['bank'], transaction['number'])
+                elif kind == 'pay':
+                    self.pay(transaction['amount'], transaction.get('account'), transaction.get('comment', ''), rng)
+                elif kind == 'gift_card':
+                    self.register_gift_card(transaction['number'], transaction['balance'])
+                elif kind == 'convert':
+                    self.convert_points(transaction['amount'])
+                else:
+                    raise ValueError(f"Unknown transaction type: {kind}")
+                applied += 1
+            except (KeyError, ValueError) as e:
+                errors.append((index, str(e)))
+        return {'applied': applied, 'errors': errors}
+
+
+class WalletSnapshot:
+    """
+    A compact, versioned binary snapshot of a Wallet for a fast restart.
+
+    Layout: a fixed header (magic, version, kind, sequence, balance, points, history lengths), the registries
+    (accounts, receivers, gift cards) as JSON, then one fixed-size row per history record with the comments and
+    activity texts in a trailing blob. Files are read through mmap. A checkpoint (kind DELTA) holds the current
+    balances and registries but only the history records appended since the previous file.
+    """
+    MAGIC = b'NPSNAP\x00\x00'
+    VERSION = 1
+    FULL, DELTA = 0, 1
+    HISTORIES = ('activity', 'charge', 'transfer', 'pay')
+    HEADER = struct.Struct('<8sHHIqqqqIIIIQ') # magic, version, kind, sequence, created_ns, base created_ns, balance, points, 4 history lengths, state length
+    ROW = struct.Struct('<qqqqQI4x') # time_ns, amount, balance, points, text offset, text length
+
+    @classmethod
+    def write(cls, path: str, source: 'Wallet', kind: int = 0, sequence: int = 0, base_ns: int = 0, since: tuple = (0, 0, 0, 0)) -> int:
+        """
+        Writes `source` to `path` (through a temporary file) and returns the snapshot's created_ns.
+
+        Parameters:
+        kind (int, optional): FULL or DELTA. For DELTA, `base_ns` is the created_ns of the full snapshot
+        and `since` the history lengths already written.
+        """
+        state = json.dumps({'accounts': [dict(source.accounts[name]) for name in source.accounts],
+                            'receivers': {nickname: source.receiver_saved[nickname] for nickname in source.receiver_saved},
+                            'gift_cards': source.gift_cards}).encode('utf-8')
+        rows = []
+        text = bytearray()
+        lengths = []
+        for history, start in zip(cls.HISTORIES, since):
+            records = source._history(history)[start:]
+            lengths.append(len(records))
+            for record in records:
+                encoded = (record['action'] if history == 'activity' else record['comment']).encode('utf-8')
+                rows.append(cls.ROW.pack(record['time_ns'], record.get('amount', 0), record['balance'], record.get('points', 0), len(text), len(encoded)))
+                text += encoded
+        created_ns = time.time_ns()
+        header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, kind, sequence, created_ns, base_ns if kind == cls.DELTA else created_ns,
+                                 source.balance, source.points, *lengths, len(state))
+        with open(path + '.tmp', 'wb') as f:
+            f.write(header + state + b''.join(rows) + text)
+        os.replace(path + '.tmp', path)
+        return created_ns
+
+    @classmethod
+    def read(cls, path: str) -> dict:
+        """
+        Reads a snapshot or checkpoint file.
+
+        Returns:
+        dict: kind, sequence, created_ns, base_ns, balance, points, state (registries) and history
+        ({'activity': [...], 'charge': [...], ...} shaped like the wallet's in-memory records).
+
+        Raises:
+        ValueError: If the file is not a wallet snapshot or has another version.
+        """
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            magic, version, kind, sequence, created_ns, base_ns, balance, points, *lengths, state_length = cls.HEADER.unpack_from(view, 0)
+            if magic != cls.MAGIC:
+                raise ValueError(f"{path} is not a wallet snapshot.")
+            if version != cls.VERSION:
+                raise ValueError(f"Unsupported wallet snapshot version {version} (expected {cls.VERSION}).")
+            offset = cls.HEADER.size
+            state = json.loads(view[offset:offset + state_length])
+            offset += state_length
+            text_start = offset + sum(lengths) * cls.ROW.size
+            history = {}
+            for name, length in zip(cls.HISTORIES, lengths):
+                records = history[name] = []
+                for time_ns, amount, row_balance, row_points, text_offset, text_length in cls.ROW.iter_unpack(view[offset:offset + length * cls.ROW.size]):
+                    text = view[text_start + text_offset:text_start + text_offset + text_length].decode('utf-8')
+                    if name == 'activity':
+                        records.append({'time_ns': time_ns, 'action': text, 'balance': row_balance, 'points': row_points})
+                    else:
+                        records.append({'time_ns': time_ns, 'amount': amount, 'balance': row_balance, 'comment': text})
+                offset += length * cls.ROW.size
+        return {'kind': kind, 'sequence': sequence, 'created_ns': created_ns, 'base_ns': base_ns,
+                'balance': balance, 'points': points, 'state': state, 'history': history}
+
+
+def bonus_tiers(odds: tuple = None, bonuses: tuple = None) -> tuple:
+    """
+    Returns bonus tiers shaped like Wallet.BONUS_TIERS, with other odds or bonus amounts.
+
+    Parameters:
+    odds (tuple, optional): Whole-percent chances of each tier, summing to 100. Default is (90, 9, 1).
+    bonuses (tuple, optional): The bonus points of each tier. Default is (100, 2000, 5000).
+    """
+    if odds is None and bonuses is None:
+        return Wallet.BONUS_TIERS
+    default_odds = []
+    previous = 0
+    for highest, _ in Wallet.BONUS_TIERS:
+        default_odds.append(highest - previous)
+        previous = highest
+    odds = tuple(odds if odds is not None else default_odds)
+    bonuses = tuple(bonuses if bonuses is not None else (points for _, points in Wallet.BONUS_TIERS))
+    if len(odds) != len(bonuses) or sum(odds) != 100 or min(odds) < 0:
+        raise ValueError("The tier odds must be whole percents summing to 100, one per bonus.")
+    tiers = []
+    highest = 0
+    for chance, points in zip(odds, bonuses):
+        highest += chance
+        tiers.append((highest, points))
+    return tuple(tiers)
+
+
+def payment_points(amounts, seed: int = None, tiers: tuple = None):
+    """
+    Applies the payment points rules of `Wallet.pay` to an array of payment amounts in one go.
+
+    Each payment earns int(amount * POINT_RATE) and draws randint(1, 100) for a bonus tier, exactly like
+    `earn_points` and `award_additional_points`; only the random stream differs.
+
+    Parameters:
+    amounts (sequence): Payment amounts.
+    seed (int, optional): Seed of the random generator.
+    tiers (tuple, optional): Bonus tiers from `bonus_tiers`. Default is Wallet.BONUS_TIERS.
+
+    Returns:
+    tuple: (earned, bonus) per payment, as NumPy arrays when NumPy is installed, otherwise lists.
+    """
+    tiers = tiers or Wallet.BONUS_TIERS
+    if np is None:
+        rng = random.Random(seed)
+        earned = [int(amount * Wallet.POINT_RATE) for amount in amounts]
+        bonus = []
+        for _ in earned:
+            chance = rng.randint(1, 100)
+            bonus.append(next(points for highest, points in tiers if chance <= highest))
+        return earned, bonus
+    amounts = np.asarray(amounts, dtype=np.int64)
+    earned = np.trunc(amounts * Wallet.POINT_RATE).astype(np.int64) # same float64 product and truncation as int()
+    chance = np.random.default_rng(seed).integers(1, 101, size=len(amounts))
+    highest = np.array([tier[0] for tier in tiers])
+    points = np.array([tier[1] for tier in tiers], dtype=np.int64)
+    return earned, points[np.searchsorted(highest, chance)]
+
+
+def forecast_points(amounts, trials: int = 10000, seed: int = None, odds: tuple = None, bonuses: tuple = None) -> dict:
+    """
+    Monte Carlo forecast of the points liability (earned + bonus points) of a set of payments.
+
+    The earned points do not depend on chance, so they are computed once. Every trial then needs only how
+    many payments landed in each bonus tier, which is one multinomial draw per trial with the tier odds,
+    so a trial costs the same for a thousand or a million payments.
+
+    Parameters:
+    amounts (sequence): Payment amounts of one period, e.g. the amounts in `wallet.pay_comment`.
+    trials (int, optional): The number of simulated periods. Default is 10000.
+    seed (int, optional): Seed of the random generator, for reproducible forecasts.
+    odds (tuple, optional): Whole-percent tier odds. See `bonus_tiers`.
+    bonuses (tuple, optional): Bonus points per tier. See `bonus_tiers`.
+
+    Returns:
+    dict: payments, trials, earned points, and the mean, standard deviation, p95 and p99 of the liability and of the bonus points.
+    """
+    tiers = bonus_tiers(odds, bonuses)
+    tier_odds = []
+    previous = 0
+    for highest, _ in tiers:
+        tier_odds.append((highest - previous) / 100)
+        previous = highest
+    tier_points = [points for _, points in tiers]
+    if np is None:
+        rng = random.Random(seed)
+        amounts = list(amounts)
+        earned = sum(int(amount * Wallet.POINT_RATE) for amount in amounts)
+        bonus = sorted(sum(rng.choices(tier_points, weights=tier_odds, k=len(amounts))) for _ in range(trials))
+        mean = sum(bonus) / trials
+        std = (sum((value - mean) ** 2 for value in bonus) / trials) ** 0.5
+        percentile = lambda q: bonus[min(trials - 1, int(q * trials))]
+        p95, p99 = percentile(0.95), percentile(0.99)
+    else:
+        amounts = np.asarray(amounts, dtype=np.int64)
+        earned = int(np.trunc(amounts * Wallet.POINT_RATE).sum())
+        counts = np.random.default_rng(seed).multinomial(len(amounts), tier_odds, size=trials)
+        bonus = counts @ np.array(tier_points, dtype=np.int64)
+        mean, std = float(bonus.mean()), float(bonus.std())
+        p95, p99 = (float(value) for value in np.percentile(bonus, [95, 99]))
+    return {'payments': len(amounts), 'trials': trials, 'earned': earned,
+            'bonus_mean': mean, 'bonus_std': std, 'bonus_p95': p95, 'bonus_p99': p99,
+            'mean': earned + mean, 'p95': earned + p95, 'p99': earned + p99}
+
+
+wallet = Wallet()
+read_input = input # replaced by run_script to drive the menus without a TTY
+
+
+class ReturnToMainMenu(Exception):
+    """
+    Raised by validate_input when the user presses 'q'; main_menu catches it and shows the menu again.
+    """
+
+
+class ScriptExhausted(Exception):
+    """
+    Raised by a scripted input source when it has no keystrokes left.
+    """
+
+
+class DiscardOutput(io.TextIOBase):
+    """
+    A stdout replacement that drops everything written to it.
+    """
+    def write(self, text: str) -> int:
+        return len(text)
 
-# global variables
-balance = 0
-accounts = {}
-points = 0
-receiver_saved = {}
-gift_cards = {}
-activity_log = []
-charge_comment = []
-transfer_comment = []
-pay_comment = []
 
 def validate_input(**kwargs): # **kwargs: Variable keyword arguments (asterisk)
     """
@@ -28,7 +1095,7 @@ def validate_input(**kwargs): # **kwargs: Variable keyword arguments (asterisk)
 
     Returns:
     input_value (int or str): The valid input received from the user.
-    if user inputs 'q', return_to_main_menu() is called.
+    if user inputs 'q', return_to_main_menu() is called, which ends the current task.
     """
     while True:
         try:
@@ -37,10 +1104,9 @@ def validate_input(**kwargs): # **kwargs: Variable keyword arguments (asterisk)
             valid_range = kwargs.get('valid_range', None)
             regex = kwargs.get('regex', None)
 
-            input_value = input(prompt)
+            input_value = read_input(prompt)
             if input_value.lower() == 'q': # check if user wants to quit
                 return_to_main_menu()
-                continue
             if input_type == 'int': # check if input is an integer
                 input_value = int(input_value)
                 if input_value <= 0:  # check if input is a positive integer
@@ -68,10 +1134,14 @@ def main_menu():
 
     The user's choice is validated using the `validate_input` function, which ensures the input is an integer
     within the valid range of 1 to 8. Depending on the user's choice, the corresponding function is called.
+    Pressing 'q' in any task raises ReturnToMainMenu, which is caught here, so the stack depth stays
+    constant however long the session runs.
 
     Raises:
     ValueError: If the input from `validate_input` is not a valid integer or not within the range of 1 to 8.
     """
+    handlers = {1: check_balance, 2: top_up, 3: transfer_money, 4: make_payment,
+                5: register_giftcard, 6: view_activities, 7: convert_points_to_balance, 8: exit_options}
     while True:
         print("\nNaver Pay")
         print("1. Check My Pay")
@@ -83,30 +1153,17 @@ def main_menu():
         print("7. Convert Points to Balance")
         print("8. Exit Naver Pay")
         print("==If you want to quit, please press 'q' anytime in any process==")
-        choice = validate_input(prompt="Please select a menu >> ", input_type='int', valid_range=range(1, 9))
-
-        if choice == 1:
-            check_balance()
-        elif choice == 2:
-            top_up()
-        elif choice == 3:
-            transfer_money()
-        elif choice == 4:
-            make_payment()
-        elif choice == 5:
-            register_giftcard()
-        elif choice == 6:
-            view_activities()
-        elif choice == 7:
-            convert_points_to_balance()
-        elif choice == 8:
-            exit_options()
+        try:
+            choice = validate_input(prompt="Please select a menu >> ", input_type='int', valid_range=range(1, 9))
+            handlers[choice]()
+        except ReturnToMainMenu:
+            continue
 
 def print_accounts():
     """
     Prints a list of accounts.
     """
-    for name, details in accounts.items():
+    for name, details in wallet.accounts.items():
         print(f"{name}: {details['bank']} - {details['number']}")
 
 def view_comment(comment_list: list, action: str):
@@ -115,13 +1172,16 @@ def view_comment(comment_list: list, action: str):
 
     Parameters:
     comment_list (list): A list of dictionaries where each dictionary represents a comment.
-    Each dictionary contains the date, amount, balance, and comment string.
+    Each dictionary contains the time (epoch nanoseconds), amount, balance, and comment string.
 
     action (str): The type of action. It can be "charge", "transfer", or "pay".
 
     Returns:
     None: This function doesn't return anything; it only prints the comment history.
     """
+    if wallet.ledger is not None:
+        view_ledger(action)
+        return
     print("\nMy Comment History")
     if not comment_list:
         print("No comments recorded yet.")
@@ -134,7 +1194,7 @@ def view_comment(comment_list: list, action: str):
         print("|Date|Money Payed|Balance|Comments|")
     print("|---|---|---|---|")
     for log in comment_list:
-        print(f"|{log['date']}|{log['amount']} ₩|{log['balance']} ₩|{log['comment']}|")
+        print(f"|{format_time(log['time_ns'])}|{log['amount']} ₩|{log['balance']} ₩|{log['comment']}|")
 
 
 def log_transaction(amount: int, comment_str: str, comment_list: list, balance: int):
@@ -145,40 +1205,80 @@ def log_transaction(amount: int, comment_str: str, comment_list: list, balance:
     amount (int): The amount of money involved in the transaction.
     comment_str (str): A string that describes the transaction.
     comment_list (list): A list of dictionaries where each dictionary represents a comment.
-    Each dictionary contains the date, amount, balance, and comment string.
+    Each dictionary contains the time (epoch nanoseconds), amount, balance, and comment string.
     balance (float): The current balance after the transaction.
 
     Returns:
     None: This function doesn't return anything; it only modifies the comment_list.
     """
-    current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    comment_list.append({'date': current_time, 'amount': amount, 'balance': balance, 'comment': comment_str})
+    current_time = time.time_ns() # formatted only when the history is rendered
+    if comment_list:
+        current_time = max(current_time, comment_list[-1]['time_ns']) # keep the list sorted by time even if the clock goes back
+    comment_list.append({'time_ns': current_time, 'amount': amount, 'balance': balance, 'comment': comment_str})
 
 
 def log_activity(action: str):
     """
-    Logs an activity by appending a dictionary to the activity_log list.
+    Logs an activity by appending a dictionary to the wallet's activity_log list.
 
     Parameters:
     action (str): A string that describes the activity.
 
     """
-    current_time = datetime.now().strftime('%Y-%m-%d')
-    activity_log.append({'date': current_time, 'action': action, 'balance': f"{balance}₩", 'points': f"{points}p"})
+    wallet.log_activity(action)
 
 
 def view_activities():
     """
     Prints the user's activity history.
     """
+    if wallet.ledger is not None:
+        view_ledger("activity")
+        return
     print("\nMy Activity History")
-    if not activity_log:
+    if not wallet.activity_log:
         print("No activities recorded yet.")
         return
     print("|Date|Action|Balance|Points|")
     print("|---|---|---|---|")
-    for log in activity_log:
-        print(f"|{log['date']}|{log['action']}|{log['balance']}|{log['points']}|")
+    for log in wallet.activity_log:
+        print(f"|{format_time(log['time_ns'], DATE_FORMAT)}|{log['action']}|{log['balance']}₩|{log['points']}p|")
+
+def view_ledger(kind: str, page_size: int = 20):
+    """
+    Prints the history of one kind from the wallet's ledger, one page at a time.
+
+    The most recent page is shown first; the user can then enter another page number,
+    or press Enter to return.
+
+    Parameters:
+    kind (str): "charge", "transfer", "pay" or "activity".
+    page_size (int, optional): The number of rows per page. Default is 20.
+    """
+    headers = {'charge': "|Date|Money Charged|Balance|Comments|", 'transfer': "|Date|Money Sent|Balance|Comments|",
+               'pay': "|Date|Money Payed|Balance|Comments|", 'activity': "|Date|Action|Balance|Points|"}
+    print("\nMy Activity History" if kind == "activity" else "\nMy Comment History")
+    total = wallet.ledger.count(kind)
+    if not total:
+        print("No activities recorded yet." if kind == "activity" else "No comments recorded yet.")
+        return
+    pages = (total + page_size - 1) // page_size
+    page = pages
+    while True:
+        print(headers[kind])
+        print("|---|---|---|---|")
+        for log in wallet.ledger.query(kind, page=page, page_size=page_size):
+            if kind == "activity":
+                print(f"|{format_time(log['time_ns'], DATE_FORMAT)}|{log['action']}|{log['balance']}₩|{log['points']}p|")
+            else:
+                print(f"|{format_time(log['time_ns'])}|{log['amount']} ₩|{log['balance']} ₩|{log['comment']}|")
+        choice = validate_input(prompt=f"Page {page}/{pages}. Enter a page number or press Enter to return >> ", input_type='str')
+        if not choice:
+            return
+        if not choice.isdigit() or not 1 <= int(choice) <= pages:
+            print("Invalid input. Please enter a valid option.")
+            continue
+        page = int(choice)
 
 def exit_options():
     """
@@ -189,10 +1289,13 @@ def exit_options():
 
 def return_to_main_menu():
     """
-    Prints a message and returns to the main menu.
+    Prints a message and returns to the main menu by unwinding the current task.
+
+    Raises:
+    ReturnToMainMenu: Always; caught by main_menu.
     """
     print("Ending the current task and returning to the main menu.")
-    main_menu()
+    raise ReturnToMainMenu()
 
 def check_balance():
     """
@@ -200,18 +1303,18 @@ def check_balance():
     """
     print("\nMy Pay Information")
     print(f"Name: Team2")
-    print(f"Balance: {balance}₩")
-    if accounts:
+    print(f"Balance: {wallet.balance}₩")
+    if wallet.accounts:
         print("Registered Accounts:")
-        for name, details in accounts.items():
+        for name, details in wallet.accounts.items():
             print(f"{name}: {details['bank']} - {details['number']}")
     else:
         print("Registered Accounts: None")
 
-    print(f"Points: {points}p")
+    print(f"Points: {wallet.points}p")
     log_activity("Checked Pay Information")
 
-    if balance == 0 or not accounts:
+    if wallet.balance == 0 or not wallet.accounts:
         print("\n1. Would you like to charge your balance?")
         print("2. Would you like to register an account?")
         print("3. Back to main menu")
@@ -226,19 +1329,21 @@ def check_balance():
 def register_account():
     """
     Registers a new bank account.
+
+    Returns:
+    str: The name of the registered account.
     """
     while True:
         print("\nRegister Account")
-        bank = validate_input(prompt="Enter the name of the bank (only alphabets, max 5 characters) >> ", input_type='str', regex='^[A-Za-z]{1,5}$')
-        number = validate_input(prompt="Enter the account number (only digits, max 14 characters) >> ", input_type='str', regex='^\d{1,14}$')
-        if number in [account['number'] for account in accounts.values()]:
-            print("This account is already registered. Please enter a different account number.")
+        bank = validate_input(prompt="Enter the name of the bank (only alphabets, max 5 characters) >> ", input_type='str', regex=BANK_REGEX)
+        number = validate_input(prompt="Enter the account number (only digits, max 14 characters) >> ", input_type='str', regex=ACCOUNT_REGEX)
+        try:
+            name = wallet.register_account(bank, number)
+        except ValueError as e:
+            print(e)
             continue
-        initial_balance = 100000
-        name = str(len(accounts) + 1)
-        accounts[name] = {'bank': bank, 'number': number, 'balance': initial_balance}
-        print(f"Account registered: {name} - {bank} {number}, Initial balance: {initial_balance}₩")
-        break
+        print(f"Account registered: {name} - {bank} {number}, Initial balance: {wallet.accounts[name]['balance']}₩")
+        return name
 
 def top_up(charge_amount: int = None, skip_prompt: bool = False):
     """
@@ -247,104 +1352,97 @@ def top_up(charge_amount: int = None, skip_prompt: bool = False):
     Parameters:
     charge_amount (int, optional): The amount to charge. If not provided, the user will be prompted to enter it.
     skip_prompt (bool, optional): If True, skips the initial prompt and goes straight to charging. Default is False.
-    """
-    global balance
 
+    Returns:
+    bool: True if the balance was charged.
+    """
     if not skip_prompt: # if skip_prompt is False, show the prompt
         sub_menu = validate_input(prompt="1) Acitivity\n2) Charge\nq) quit\nchoice >>", input_type='int', valid_range=[1, 2])
         if sub_menu == 1:
-            view_comment(charge_comment, "charge")
-            return
+            view_comment(wallet.charge_comment, "charge")
+            return False
         elif sub_menu == 2:
             pass
 
-    if not accounts: # if there are no registered accounts, prompt the user to register an account, and then go back to the main menu
+    if not wallet.accounts: # if there are no registered accounts, prompt the user to register an account, and then go back to the main menu
         print("\nNo registered accounts. Please register an account first.")
         register_account()
-        return
+        return False
 
     charge_choice = validate_input(prompt="1) select account\n2) register new account\nq) quit\nchoice >>  ", input_type='int', valid_range=[1, 2])
 
     if charge_choice == 2: # if the user chooses to register a new account, call the register_account function
-        register_account()
-        selected_account = list(accounts.values())[-1]
+        account_name = register_account()
     elif charge_choice == 1: # if the user chooses to select an existing account
         print("\nList of registered accounts\n")
         print_accounts()
-        account_option = validate_input(prompt="\nSelect an account to charge >> ", input_type='int', valid_range=range(1, len(accounts) + 1)) # validate the account number
-        selected_account = accounts[str(account_option)]
+        account_option = validate_input(prompt="\nSelect an account to charge >> ", input_type='int', valid_range=range(1, len(wallet.accounts) + 1)) # validate the account number
+        account_name = str(account_option)
 
     if charge_amount is None: # if charge_amount is not provided, prompt the user to enter the amount
         amount = validate_input(prompt="Enter the amount to charge >> ", input_type='int')
     else: # if charge_amount is provided, use that amount
         amount = charge_amount
 
-    def update_balance(): # higher order function
-        global balance
-        balance += amount
-
-    if selected_account['balance'] < amount:
-        print("Insufficient account balance.")
+    try:
+        wallet.charge(amount, account_name, comment=None) # the comment is logged after asking for it
+    except ValueError as e:
+        print(e)
         print("Returning to the main screen")
-        return
+        return False
 
-    selected_account['balance'] -= amount
-    update_balance()  # update balance
-    print(f"Charge completed. Account balance: {selected_account['balance']}₩, My Pay balance: {balance}₩")
-    log_activity(f"Account charge: {amount}₩")
+    print(f"Charge completed. Account balance: {wallet.accounts[account_name]['balance']}₩, My Pay balance: {wallet.balance}₩")
     comment_str = validate_input(prompt="Would you like to add a comment related to the charge? (Enter comment/Enter if none) >> ", input_type='str')
-    log_transaction(amount, comment_str, charge_comment, balance)
+    wallet.log_transaction('charge', amount, comment_str)
+    return True
 
 
 def transfer_money():
     """
     Transfers money from the user's account to another account.
     """
-    global balance
-
     sub_menu = validate_input(prompt="1) Acitivity\n2) Transfer\nq) quit\nchoice >>", input_type='int', valid_range=[1, 2])
     if sub_menu == 1:
-        view_comment(transfer_comment, "transfer")
+        view_comment(wallet.transfer_comment, "transfer")
         return
     elif sub_menu == 2:
         pass
 
     print("\nTransfer Money")
 
-    if not accounts: # if there are no registered accounts, prompt the user to register an account, and then go back to the main menu
+    if not wallet.accounts: # if there are no registered accounts, prompt the user to register an account, and then go back to the main menu
         print("No registered accounts. Please register an account first.")
         register_account()
         return
 
     amount = validate_input(prompt="Enter the amount to transfer >> ", input_type='int')
 
-    min_charge = lambda x: (x - balance + 999) // 1000 * 1000 # lambda function to calculate the minimum charge amount
-
-    if balance < amount: # if the balance is less than the transfer amount, charge the balance
-        print("Insufficient balance. The minimum charge amount is {}.".format(min_charge(amount)))
+    if wallet.balance < amount: # if the balance is less than the transfer amount, charge the balance
+        print("Insufficient balance. The minimum charge amount is {}.".format(wallet.min_charge(amount)))
         print("Proceeding automatic charge. Please select the charge method.")
-        top_up(min_charge(amount), skip_prompt=True) #skip the prompt and charge the balance
+        if not top_up(wallet.min_charge(amount), skip_prompt=True): #skip the prompt and charge the balance
+            print("Transfer cancelled.")
+            return
         print("\nAutomatic charge completed!\n")
 
     receiver_name = validate_input(prompt="Enter the receiver's name >> ", input_type='str')
-    receiver_bank = validate_input(prompt="Enter the receiver's bank name (only alphabets, max 5 characters) >> ", input_type='str', regex='^[A-Za-z]{1,5}$') # validate the bank name(ex) NH, KB, IBK..)
-    receiver_account = validate_input(prompt="Enter the receiver's account number (only digits, max 14 digits) >> ", input_type='str', regex='^\d{1,14}$') # validate the account number(no dash)
+    receiver_bank = validate_input(prompt="Enter the receiver's bank name (only alphabets, max 5 characters) >> ", input_type='str', regex=BANK_REGEX) # validate the bank name(ex) NH, KB, IBK..)
+    receiver_account = validate_input(prompt="Enter the receiver's account number (only digits, max 14 digits) >> ", input_type='str', regex=ACCOUNT_REGEX) # validate the account number(no dash)
 
     save_info = validate_input(prompt="Would you like to save this information? (Y/N) >> ", input_type='str', valid_range=['Y', 'N', 'y', 'n'])
 
     if save_info.lower() == 'y': # if the user wants to save the receiver's information
         nickname = validate_input(prompt="Enter a nickname to save >> ", input_type='str')
-        receiver_saved[nickname] = {'name': receiver_name, 'bank': receiver_bank, 'number': receiver_account}
+        wallet.save_receiver(nickname, receiver_name, receiver_bank, receiver_account)
         print(f"Saved: '{nickname}' - ({receiver_name}, {receiver_bank}, {receiver_account})")
 
     confirm = validate_input(prompt=f"Are you sure you want to transfer {amount} to {receiver_name}? (Y/N) >> ", input_type='str', valid_range=['Y', 'N', 'y', 'n'])
 
     if confirm.lower() == 'y':
-        balance -= amount
-        print(f"Transfer completed. Remaining balance: {balance}")
-        log_activity(f"Transfer: {amount}")
+        wallet.transfer(amount, receiver_name, receiver_bank, receiver_account, comment=None)
+        print(f"Transfer completed. Remaining balance: {wallet.balance}")
         comment_str = validate_input(prompt="Would you like to add a comment related to the transfer? (Enter comment/Press enter if none) >> ", input_type='str')
-        log_transaction(amount, comment_str, transfer_comment, balance)
+        wallet.log_transaction('transfer', amount, comment_str)
     else: # if the user cancels the transfer
         print("Transfer cancelled.") # print a message that the transfer is cancelled and go main menu
 
@@ -353,73 +1451,39 @@ def make_payment():
     """
     Makes a payment and earns points based on the payment amount.
     """
-    global balance
-
     sub_menu = validate_input(prompt="1) Activity\n2) Make payment\nq) quit >> ", input_type='int', valid_range=[1, 2])
     if sub_menu == 1:
-        view_comment(pay_comment, "pay")
+        view_comment(wallet.pay_comment, "pay")
         return
     elif sub_menu == 2:
         pass
 
     print("\nPay")
-    global balance
-    global points
-    earned_points = 0
-
-    def earn_points(amount: int): # higher order function
-        """
-        Calculates the points earned based on the payment amount.
-
-        Parameters:
-        amount (int): The payment amount.
-        """
-        nonlocal earned_points # nonlocal keyword is used to modify the value of a variable defined in the outer function
-        earned_points = int(amount * 0.05) # calculate the points earned
-        print(f"Payment amount: {amount}, Points to be earned: {earned_points}p")
-
-    payment_amount = validate_input(prompt="Enter the amount to pay >> ", input_type='int') 
-    earn_points(payment_amount) # call the earn_points function to calculate the points earned
-
-    min_charge = lambda x: (x - balance + 999) // 1000 * 1000 # lambda function to calculate the minimum charge amount
+    payment_amount = validate_input(prompt="Enter the amount to pay >> ", input_type='int')
+    earned_points = wallet.earn_points(payment_amount) # calculate the points to be earned
+    print(f"Payment amount: {payment_amount}, Points to be earned: {earned_points}p")
 
-    if balance < payment_amount: # if the balance is less than the payment amount, charge the balance
-        print("Insufficient balance. The minimum charge amount is {}.".format(min_charge(payment_amount)))
+    if wallet.balance < payment_amount: # if the balance is less than the payment amount, charge the balance
+        print("Insufficient balance. The minimum charge amount is {}.".format(wallet.min_charge(payment_amount)))
         print("Proceeding with automatic charge. Please select the charge method.")
-        top_up(min_charge(payment_amount), skip_prompt=True)
+        if not top_up(wallet.min_charge(payment_amount), skip_prompt=True):
+            print("Payment cancelled.")
+            return
         print("\nAutomatic charge completed!\n")
 
     confirm_payment = validate_input(prompt=f"Do you want to pay {payment_amount}? (Y/N) >> ", input_type='str', valid_range=['Y', 'N', 'y', 'n'])
     if confirm_payment.lower() == 'y': # if the user confirms the payment
-        balance -= payment_amount # deduct the payment amount from the balance
-        points += earned_points # add the earned points to the total points
+        points_before = wallet.points
+        result = wallet.pay(payment_amount, comment=None) # deduct the payment, add the earned points and draw the bonus
         print("Payment completed.")
-        print(f"Payment amount: {payment_amount}, Earned points: {earned_points}p")
-        print(f"Remaining balance: {balance}, Total points: {points}p")
-        log_activity(f"Payment: {payment_amount}")
+        print(f"Payment amount: {payment_amount}, Earned points: {result['earned']}p")
+        print(f"Remaining balance: {wallet.balance}, Total points: {points_before + result['earned']}p")
         comment_str = validate_input(prompt="Would you like to add a comment related to the payment? (Enter comment/Press enter if none) >> ", input_type='str')
-        log_transaction(payment_amount, comment_str, pay_comment, balance)
-        award_additional_points()
+        wallet.log_transaction('pay', payment_amount, comment_str)
+        print(f"Congratulations! You've earned an additional {result['bonus']} points. Current points: {wallet.points}p")
     else:
         print("Payment cancelled.")
 
-def award_additional_points():
-    """
-    Awards additional points on a random chance.
-    """
-    global points
-    chance = random.randint(1, 100) # generate a random number between 1 and 100
-    additional_points = 0
-    if chance <= 90:
-        additional_points = 100
-    elif chance <= 99:
-        additional_points = 2000
-    else:
-        additional_points = 5000
-
-    points += additional_points # add the additional points to the total points
-    print(f"Congratulations! You've earned an additional {additional_points} points. Current points: {points}p")
-
 
 
 def register_giftcard():
@@ -427,16 +1491,15 @@ def register_giftcard():
     Registers a new gift card.
     """
     print("\nRegister Gift Card")
-    card_number = validate_input(prompt="Enter the gift card number (only digits, 8 characters) >> ", input_type='str', regex='^[0-9]{8}$')
+    card_number = validate_input(prompt="Enter the gift card number (only digits, 8 characters) >> ", input_type='str', regex=GIFT_CARD_REGEX)
     card_balance = validate_input(prompt="Enter the balance on the gift card >> ", input_type='int')
 
-    if card_number in gift_cards:
-        print("This gift card is already registered.")
+    try:
+        wallet.register_gift_card(card_number, card_balance)
+    except ValueError as e:
+        print(e)
         return
-
-    gift_cards[card_number] = card_balance
     print(f"Registered gift card - Number: {card_number}, Balance: {card_balance}₩")
-    log_activity("Registered Gift Card")
 
 
 
@@ -444,29 +1507,134 @@ def convert_points_to_balance():
     """
     Converts a specified amount of points to balance.
     """
-    global balance, points
-
-    if points <= 0:
+    if wallet.points <= 0:
         print("You have no points to convert.")
         return
-    print(f"You have {points} points.")
+    print(f"You have {wallet.points} points.")
 
     amount_to_convert = validate_input(prompt="Enter the amount of points you want to convert >> ", input_type='int')
 
-    if amount_to_convert > points:
+    if amount_to_convert > wallet.points:
         print("You don't have enough points to convert that amount.")
         return
 
     choice = validate_input(prompt="Do you want to convert points to balance? (Y/N) >> ", input_type='str', valid_range=['Y', 'N', 'y', 'n'])
 
     if choice.lower() == 'y':
-        balance += amount_to_convert
-        points -= amount_to_convert
-        print(f"Converted {amount_to_convert} points to {amount_to_convert}₩. Current balance: {balance}₩, points: {points}p")
-        log_activity("Converted Points to Balance")
+        wallet.convert_points(amount_to_convert)
+        print(f"Converted {amount_to_convert} points to {amount_to_convert}₩. Current balance: {wallet.balance}₩, points: {wallet.points}p")
     else:
         print("Conversion cancelled.")
 
 
+def run_script(keystrokes, target_wallet: Wallet = None, capture_output: bool = False) -> str:
+    """
+    Runs the menus with recorded keystrokes instead of a TTY.
+
+    Parameters:
+    keystrokes (iterable): One string per input() call, e.g. the lines of a recorded session.
+    target_wallet (Wallet, optional): The wallet to drive. Default is the module-level wallet.
+    capture_output (bool, optional): If True, the printed output is returned; otherwise it is discarded.
+
+    Returns:
+    str: The captured output, or an empty string.
+    The session ends at the "Exit Naver Pay" menu or when the keystrokes run out.
+    """
+    global wallet, read_input
+    keys = iter(keystrokes)
+
+    def scripted_input(prompt: str = '') -> str:
+        sys.stdout.write(prompt)
+        try:
+            return next(keys)
+        except StopIteration:
+            raise ScriptExhausted() from None
+
+    previous = wallet, read_input
+    if target_wallet is not None:
+        wallet = target_wallet
+    read_input = scripted_input
+    output = io.StringIO() if capture_output else DiscardOutput()
+    try:
+        with contextlib.redirect_stdout(output):
+            main_menu()
+    except (ScriptExhausted, SystemExit):
+        pass
+    finally:
+        wallet, read_input = previous
+    return output.getvalue() if capture_output else ''
+
+
+# register an account, top up, pay, convert points and exit
+SAMPLE_JOURNEY = ['2', '2', 'KB', '123',
+                  '2', '2', '1', '1', '50000', '',
+                  '4', '2', '20000', 'y', '',
+                  '7', '1000', 'y',
+                  '8']
+
+
+def benchmark_journeys(keystrokes=SAMPLE_JOURNEY, repeat: int = 1000) -> dict:
+    """
+    Replays a user journey `repeat` times, each on a fresh wallet, and measures the throughput.
+
+    Returns:
+    dict: The number of journeys and keystrokes, the elapsed seconds, and journeys and keystrokes per second.
+    """
+    keystrokes = list(keystrokes)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        run_script(keystrokes, Wallet())
+    elapsed = time.perf_counter() - start
+    return {'journeys': repeat, 'keystrokes': repeat * len(keystrokes), 'seconds': elapsed,
+            'journeys_per_sec': repeat / elapsed, 'keystrokes_per_sec': repeat * len(keystrokes) / elapsed}
+
+
 ################################################################################
-main_menu()
\ No newline at end of file
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Naver Pay")
+    parser.add_argument('ledger', nargs='?', help="keep the history in this ledger file")
+    parser.add_argument('--script', help="replay keystrokes from this file (one per line) instead of the keyboard")
+    parser.add_argument('--repeat', type=int, default=0, help="with --script (or the sample journey), benchmark this many runs")
+    parser.add_argument('--metrics', help="enable instrumentation and write Prometheus text to this file on exit")
+    parser.add_argument('--snapshot', help="restore the wallet from this snapshot and write a checkpoint on exit")
+    parser.add_argument('--forecast', help="forecast the points liability of the payment amounts in this file (one per line)")
+    parser.add_argument('--trials', type=int, default=10000, help="Monte Carlo trials for --forecast")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for --forecast")
+    args = parser.parse_args()
+    if args.forecast:
+        with open(args.forecast, encoding='utf-8') as f:
+            amounts = [int(line) for line in f if line.strip()]
+        result = forecast_points(amounts, args.trials, args.seed)
+        print(f"{result['payments']} payments, {result['trials']} trials - earned {result['earned']:,}p, "
+              f"liability mean {result['mean']:,.0f}p, p95 {result['p95']:,.0f}p, p99 {result['p99']:,.0f}p")
+        sys.exit()
+    if args.metrics:
+        metrics.enable(PrometheusSink(args.metrics))
+    if args.ledger:
+        wallet = Wallet.open(args.ledger)
+    if args.snapshot:
+        if os.path.exists(args.snapshot):
+            restored = Wallet.restore(args.snapshot, wallet.ledger)
+            if wallet.ledger is not None: # the ledger is the durable record of the balance and points
+                restored.balance, restored.points = wallet.balance, wallet.points
+            wallet = restored
+        else:
+            wallet.save_snapshot(args.snapshot)
+    script = None
+    if args.script:
+        with open(args.script, encoding='utf-8') as f:
+            script = f.read().splitlines()
+    try:
+        if args.repeat:
+            result = benchmark_journeys(script or SAMPLE_JOURNEY, args.repeat)
+            print(f"{result['journeys']} journeys in {result['seconds']:.2f}s - {result['journeys_per_sec']:.0f} journeys/s, {result['keystrokes_per_sec']:.0f} keystrokes/s")
+        elif script is not None:
+            print(run_script(script, capture_output=True), end='')
+        else:
+            main_menu()
+    finally:
+        if metrics.enabled:
+            metrics.flush()
+        if args.snapshot:
+            wallet.checkpoint()
@@ -0,0 +1,210 @@
+import importlib.machinery
+import importlib.util
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+
+def load_transportation():
+    # Transportation은 확장자가 없는 스크립트라 SourceFileLoader로 직접 읽는다
+    path = Path(__file__).resolve().parent.parent / "Transportation"
+    loader = importlib.machinery.SourceFileLoader("Transportation", str(path))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[loader.name] = module
+    loader.exec_module(module)
+    return module
+
+
+T = load_transportation()
+START = datetime(2024, 3, 4, 7)
+
+
+def clone_riders(riders):
+    return {user_id: T.User(user_id, user.age, T.TMoneyCard(user.balance()), user.points, dict(user.bike_pass))
+            for user_id, user in riders.items()}
+
+
+def prepare(riders, prior_logs=(), transfer_counts=()):
+    # 배치 전에 두 쪽 사용자에게 똑같은 이전 상태를 준다
+    for user_id, entry in prior_logs:
+        riders[user_id].add_log(entry)
+    for user_id, count in transfer_counts:
+        riders[user_id].transfer_count = count
+    return riders
+
+
+def events_from(taps):
+    # taps: (user_id, 탈것, 행동, 시각, 거리). 사용자별로 묶고 사용자 안에서는 들어온 순서(시간순)를 유지한다
+    ordered = sorted(taps, key=lambda tap: tap[0])
+    return {column: [tap[index] for tap in ordered]
+            for index, column in enumerate(('user_id', 'transportation', 'action', 'time', 'distance'))}
+
+
+def assert_batch_matches_sequential(riders, events, **state):
+    sequential = prepare(clone_riders(riders), **state)
+    batched = prepare(clone_riders(riders), **state)
+    before = {user_id: (user.balance(), user.points) for user_id, user in batched.items()}
+
+    fares, transfers = [], []
+    for user_id, transportation, action, current_time, distance in zip(*events.values()):
+        user = sequential[user_id]
+        fares.append(T.FareSystem.process_ride(user, transportation, user._t_money_card, action, distance, current_time))
+        transfers.append(user.log[-1][4])
+    result = T.FareSystem.process_rides_batch(batched, events)
+
+    assert list(result.fares) == fares
+    assert list(result.transfers) == transfers
+    for user_id, expected in sequential.items():
+        actual = batched[user_id]
+        assert actual.balance() == expected.balance(), user_id
+        assert actual.transfer_count == expected.transfer_count, user_id
+        assert actual.points == expected.points, user_id
+        assert list(actual.log) == list(expected.log), user_id
+        if user_id in result.balance_deltas:
+            assert result.balance_deltas[user_id] == actual.balance() - before[user_id][0]
+            assert result.points_deltas[user_id] == actual.points - before[user_id][1]
+    return result
+
+
+def test_seeded_commuters_match_sequential():
+    riders, taps = T.generate_commuters(300, seed=7, days=2)
+    events = events_from([(tap.user_id, tap.vehicle, tap.action, tap.time, tap.distance)
+                          for tap in taps if tap.vehicle != "bicycle"])
+    result = assert_batch_matches_sequential(riders, events)
+    assert any(result.transfers)
+
+
+def test_back_to_back_boards():
+    riders = {1: T.User(1, 30, T.TMoneyCard(100000)), 2: T.User(2, 15, T.TMoneyCard(100000))}
+    bus, express, metro = T.Bus("100"), T.Bus("M5107", "express"), T.Metro("Line 2")
+    taps = []
+    for user_id in riders:
+        taps += [(user_id, bus, "board", START, 0),
+                 (user_id, metro, "board", START + timedelta(minutes=5), 0),  # 하차 없이 다시 승차
+                 (user_id, express, "board", START + timedelta(hours=2), 0),  # 환승 시간이 지난 뒤 다시 승차 (벌금)
+                 (user_id, express, "alight", START + timedelta(hours=3), 40)]
+    assert_batch_matches_sequential(riders, events_from(taps))
+
+
+def test_transfer_count_rolls_over_at_max_free_transfers():
+    riders = {user_id: T.User(user_id, 30, T.TMoneyCard(100000)) for user_id in range(3)}
+    vehicles = [T.Bus("100"), T.Metro("Line 2"), T.Bus("M5107", "express"), T.Metro("Shinbundang", "dx_line")]
+    taps = []
+    for user_id in riders:
+        current_time = START
+        for leg in range(2 * T.FareSystem.MAX_FREE_TRANSFERS + 3):
+            vehicle = vehicles[(user_id + leg) % len(vehicles)]
+            taps.append((user_id, vehicle, "board", current_time, 0))
+            taps.append((user_id, vehicle, "alight", current_time + timedelta(minutes=10), 12))
+            current_time += timedelta(minutes=15)
+    # user 2는 이미 무료 환승을 다 쓴 상태에서 시작한다
+    assert_batch_matches_sequential(riders, events_from(taps), transfer_counts=[(2, T.FareSystem.MAX_FREE_TRANSFERS)])
+
+
+def test_users_after_bicycle_fall_back_to_sequential_rules():
+    riders = {user_id: T.User(user_id, 30, T.TMoneyCard(100000), bike_pass={'30day_1hour': START - timedelta(days=1)})
+              for user_id in range(4)}
+    bus, metro = T.Bus("100"), T.Metro("Line 2")
+    taps = []
+    for user_id in riders:
+        taps += [(user_id, bus, "board", START + timedelta(minutes=10 * user_id), 0),
+                 (user_id, bus, "alight", START + timedelta(minutes=10 * user_id + 20), 0),
+                 (user_id, metro, "board", START + timedelta(minutes=10 * user_id + 25), 0),
+                 (user_id, metro, "alight", START + timedelta(minutes=10 * user_id + 50), 18)]
+    # 마지막 기록이 자전거: 반납 후 30분 이내 승차(포인트), 30분이 지난 승차, 대여 중 승차
+    prior_logs = [(0, ("bicycle", START - timedelta(minutes=10), "return", 0, False)),
+                  (1, ("bicycle", START - timedelta(minutes=50), "return", 0, False)),
+                  (2, ("bicycle", START - timedelta(minutes=5), "ride", 0, False))]
+    result = assert_batch_matches_sequential(riders, events_from(taps), prior_logs=prior_logs)
+    assert result.points_deltas[0] == 100
+
+
+def test_distance_beyond_fare_table():
+    riders = {user_id: T.User(user_id, age, T.TMoneyCard(10 ** 7)) for user_id, age in enumerate((8, 16, 30, 70))}
+    metro, dx_line, express = T.Metro("Line 1"), T.Metro("Shinbundang", "dx_line"), T.Bus("M5107", "express")
+    taps = []
+    for user_id in riders:
+        for leg, vehicle in enumerate((metro, dx_line, express)):
+            boarded = START + timedelta(hours=2 * leg)
+            taps.append((user_id, vehicle, "board", boarded, 0))
+            taps.append((user_id, vehicle, "alight", boarded + timedelta(hours=1), T.MAX_TABLE_DISTANCE + 37 * (leg + 1)))
+    assert_batch_matches_sequential(riders, events_from(taps))
+
+
+def test_insufficient_balance_rejects_whole_batch():
+    riders = {1: T.User(1, 30, T.TMoneyCard(100000)), 2: T.User(2, 30, T.TMoneyCard(1000))}
+    bus = T.Bus("100")
+    events = events_from([(1, bus, "board", START, 0), (1, bus, "alight", START + timedelta(minutes=20), 0),
+                          (2, bus, "board", START, 0)])
+
+    sequential = clone_riders(riders)
+    user = sequential[2]
+    with pytest.raises(ValueError):
+        T.FareSystem.process_ride(user, bus, user._t_money_card, "board", 0, START)
+
+    batched = clone_riders(riders)
+    with pytest.raises(ValueError):
+        T.FareSystem.process_rides_batch(batched, events)
+    for user_id, user in batched.items():
+        assert user.balance() == riders[user_id].balance()
+        assert user.transfer_count == 0 and user.points == 0
+        assert len(user.log) == 0
+
+
+def rider_state(riders):
+    return {user_id: (user.balance(), user.transfer_count, user.points, list(user.log)) for user_id, user in riders.items()}
+
+
+class ShuttleBus(T.Bus):
+    MODE_CODE = -1  # 요금표에 없는 교통수단: 스칼라 경로로 정산된다
+
+
+@pytest.mark.parametrize("path", ["vectorized", "no_numpy", "unknown_vehicle"])
+def test_short_balance_after_bicycle_changes_nothing(monkeypatch, path):
+    if path == "no_numpy":
+        monkeypatch.setattr(T, "np", None)
+    bus = ShuttleBus("shuttle") if path == "unknown_vehicle" else T.Bus("100")
+    riders = {1: T.User(1, 30, T.TMoneyCard(100000)), 2: T.User(2, 30, T.TMoneyCard(1000))}
+    riders[2].add_log(("bicycle", START - timedelta(minutes=10), "return", 0, False))
+    before = rider_state(riders)
+    events = events_from([(1, bus, "board", START, 0), (1, bus, "alight", START + timedelta(minutes=20), 0),
+                          (2, bus, "board", START, 0)])
+    with pytest.raises(ValueError):
+        T.FareSystem.process_rides_batch(riders, events)
+    assert rider_state(riders) == before
+
+
+@pytest.mark.parametrize("path", ["vectorized", "no_numpy"])
+def test_shared_card_is_checked_as_a_whole(monkeypatch, path):
+    if path == "no_numpy":
+        monkeypatch.setattr(T, "np", None)
+    card = T.TMoneyCard(2000)
+    riders = {1: T.User(1, 30, card), 2: T.User(2, 30, card)}
+    bus = T.Bus("100")
+    events = events_from([(1, bus, "board", START, 0), (2, bus, "board", START, 0)])
+    with pytest.raises(ValueError):
+        T.FareSystem.process_rides_batch(riders, events)
+    assert card.balance == 2000
+    assert all(len(user.log) == 0 for user in riders.values())
+
+    card.charge(1000)
+    result = T.FareSystem.process_rides_batch(riders, events)
+    assert card.balance == 0 and list(result.fares) == [1500, 1500]
+
+
+def test_board_after_bicycle_in_a_transfer_chain_starts_a_new_chain():
+    riders = {user_id: T.User(user_id, 30, T.TMoneyCard(100000), bike_pass={'30day_1hour': START - timedelta(days=1)})
+              for user_id in range(2)}
+    metro = T.Metro("Line 2")
+    # 버스 -> 버스(환승) -> 자전거를 탄 뒤 transfer_count가 남은 채로 지하철에 승차한다
+    prior_logs = [(0, ("bicycle", START - timedelta(minutes=10), "return", 0, False)),
+                  (1, ("bicycle", START - timedelta(minutes=50), "return", 0, False))]
+    taps = [(user_id, metro, action, START + timedelta(minutes=minutes), distance)
+            for user_id in riders for action, minutes, distance in (("board", 0, 0), ("alight", 30, 16))]
+    result = assert_batch_matches_sequential(riders, events_from(taps), prior_logs=prior_logs, transfer_counts=[(0, 1), (1, 2)])
+    assert list(result.fares) == [1400, 100, 1400, 100]
+    assert not any(result.transfers)
+    assert result.points_deltas == {0: 100, 1: 0}
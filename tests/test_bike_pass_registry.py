@@ -0,0 +1,49 @@
+import importlib.machinery
+import importlib.util
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+def load_transportation():
+    # Transportation은 확장자가 없는 스크립트라 SourceFileLoader로 직접 읽는다
+    path = Path(__file__).resolve().parent.parent / "Transportation"
+    loader = importlib.machinery.SourceFileLoader("Transportation", str(path))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[loader.name] = module
+    loader.exec_module(module)
+    return module
+
+
+T = load_transportation()
+START = datetime(2024, 3, 4, 7)
+
+
+def rider(user_id, pass_type, purchase_date):
+    return T.User(user_id, 30, T.TMoneyCard(0), bike_pass={pass_type: purchase_date})
+
+
+def test_sweep_keeps_a_pass_renewed_behind_the_registry():
+    registry = T.BikePassRegistry()
+    renewed, lapsed = rider(1, '7day_1hour', START), rider(2, '7day_1hour', START)
+    registry.add_many([renewed, lapsed])
+    renewed.update_bike_pass({'30day_1hour': START + timedelta(days=3)})
+
+    assert registry.expiring(START + timedelta(days=8)) == [(2, START + timedelta(days=7))]
+    assert registry.sweep(START + timedelta(days=8)) == [lapsed]
+    assert renewed.bike_pass == {'30day_1hour': START + timedelta(days=3)}
+    assert registry.expiry(1) == START + timedelta(days=33)
+    assert registry.sweep(START + timedelta(days=34)) == [renewed]
+    assert not renewed.bike_pass and len(registry) == 0
+
+
+def test_expiring_skips_emptied_buckets():
+    registry = T.BikePassRegistry()
+    registry.add(rider(1, 'daily_1hour', datetime(2000, 1, 1)))
+    registry.remove(1)
+    current = rider(2, '30day_2hour', START)
+    registry.add(current)
+    assert registry.expiring(START + timedelta(days=31)) == [(2, START + timedelta(days=30))]
+    assert registry.expiring(START + timedelta(days=31), since=START + timedelta(days=30)) == []
+    assert registry.sweep(START + timedelta(days=31)) == [current]
@@ -0,0 +1,75 @@
+import importlib.machinery
+import importlib.util
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+def load_transportation():
+    # Transportation은 확장자가 없는 스크립트라 SourceFileLoader로 직접 읽는다
+    path = Path(__file__).resolve().parent.parent / "Transportation"
+    loader = importlib.machinery.SourceFileLoader("Transportation", str(path))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[loader.name] = module
+    loader.exec_module(module)
+    return module
+
+
+T = load_transportation()
+START = datetime(2024, 3, 4, 7)
+
+
+def tap(user_id, mode, action, minutes, distance=0, name="100", trans_type="regular", age=30):
+    return T.TapEvent(user_id, age, 0, mode, name, trans_type, action, START + timedelta(minutes=minutes), distance)
+
+
+TAPS = [tap(1, "bus", "board", 0), tap(1, "bus", "alight", 20, 4),
+        tap(1, "metro", "board", 60, name="Line 2"), tap(1, "metro", "alight", 90, 27, name="Line 2"),
+        tap(2, "metro", "board", 0, name="Line 2", age=15), tap(2, "metro", "alight", 30, 12, name="Line 2", age=15)]
+
+
+def fare_constants():
+    return (T.Bus.BASE_FARE, T.Metro.BASE_FARE, T.Transportation.ADDITIONAL_FARE,
+            T.FareSystem.TRANSFER_TIME_LIMIT, T.FareSystem.MAX_FREE_TRANSFERS, T.FARE_TABLES)
+
+
+def test_scenario_prices_with_its_own_config():
+    scenario = T.FareScenario("bus+100", bus_base_fare={'regular': {'adult': 1600}}, additional_fare={'adult': 200},
+                              transfer_time_limit=timedelta(minutes=45))
+    fares = T.scenario_fare_config(scenario)
+    user = T.User(1, 30, T.TMoneyCard(100000))
+    bus, metro = T.Bus("100"), T.Metro("Line 2")
+    assert T.FareSystem.process_ride(user, bus, user._t_money_card, "board", 0, START, fares=fares) == 1600
+    T.FareSystem.process_ride(user, bus, user._t_money_card, "alight", 4, START + timedelta(minutes=20), fares=fares)
+    # 40분 뒤라도 45분 안이라 환승
+    assert T.FareSystem.process_ride(user, metro, user._t_money_card, "board", 0, START + timedelta(minutes=60), fares=fares) == 0
+    assert T.FareSystem.process_ride(user, metro, user._t_money_card, "alight", 27, START + timedelta(minutes=90), fares=fares) == 3 * 200
+
+    user = T.User(2, 30, T.TMoneyCard(100000))
+    assert T.FareSystem.process_ride(user, bus, user._t_money_card, "board", 0, START) == 1500
+
+
+def test_simulation_leaves_live_fares_alone():
+    before = fare_constants()
+    aggregates = T.enable_fare_aggregates()
+    try:
+        results = T.simulate_fare_scenarios(TAPS, [T.FareScenario("bus+100", bus_base_fare={'regular': {'adult': 1600}})])
+    finally:
+        T.disable_fare_aggregates()
+    assert fare_constants() == before
+    assert aggregates.revenue("bus") == 0 and aggregates.revenue("metro") == 0
+    assert [result['revenue'] for result in results] == [results[0]['revenue'], results[0]['revenue'] + 100]
+
+
+def test_bad_rows_are_counted_as_rejected(tmp_path):
+    path = tmp_path / "taps.csv"
+    path.write_text("user_id,age,balance,mode,name,trans_type,action,time,distance\n"
+                    "1,30,0,bus,100,regular,board,2024-03-04T07:00:00,0\n"
+                    "1,30,0,bus,100,regular,board,not a time,0\n"
+                    "2,30,0,tram,T1,regular,board,2024-03-04T07:00:00,0\n"
+                    "3,30,0,metro,Line 2,express,board,2024-03-04T07:00:00,0\n"
+                    "1,30,0,bus,100,regular,alight,2024-03-04T07:20:00,4\n")
+    events = T._replay_events(*T._open_tap_lines(str(path)))
+    [result] = T.simulate_fare_scenarios(events, [])
+    assert (result['taps'], result['rejected'], result['revenue']) == (5, 3, 1500)
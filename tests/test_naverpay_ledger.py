@@ -0,0 +1,109 @@
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+
+def load_naverpay():
+    path = Path(__file__).resolve().parent.parent / "Naverpay_Implement_Team_2.py"
+    spec = importlib.util.spec_from_file_location("Naverpay_Implement_Team_2", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+N = load_naverpay()
+
+
+@pytest.fixture
+def ledger_path(tmp_path):
+    path = str(tmp_path / "ledger.bin")
+    ledger = N.Ledger(path)
+    for row in range(6):
+        kind = N.Ledger.KINDS[row % len(N.Ledger.KINDS)]
+        ledger.append(kind, 100 * row, 1000 + row, row, f"row {row}", time_ns=10 ** 9 * (row + 1))
+    ledger.close()
+    return path
+
+
+def rows(ledger):
+    return [ledger.record(row) for row in range(len(ledger))]
+
+
+def test_reopen_keeps_every_record(ledger_path):
+    ledger = N.Ledger(ledger_path)
+    assert len(ledger) == 6
+    assert ledger.last()['comment'] == "row 5"
+    assert [record['amount'] for record in ledger.query('pay')] == [200]
+    ledger.close()
+
+
+@pytest.mark.parametrize("suffix", ["", ".text", ".pay.idx"])
+def test_torn_tail_is_cut_and_appends_stay_aligned(ledger_path, suffix):
+    before = N.Ledger(ledger_path)
+    expected = rows(before)
+    before.close()
+    with open(ledger_path + suffix, 'ab') as f:
+        f.write(b"\x01" * 10) # a crash in the middle of a write
+
+    ledger = N.Ledger(ledger_path)
+    assert rows(ledger) == expected
+    ledger.append('pay', 700, 2000, 9, "after crash", time_ns=10 ** 10)
+    ledger.close()
+
+    reopened = N.Ledger(ledger_path)
+    assert rows(reopened) == expected + [reopened.record(6)]
+    assert reopened.last() == {'kind': 'pay', 'time_ns': 10 ** 10, 'amount': 700, 'balance': 2000, 'points': 9, 'comment': "after crash"}
+    assert [record['comment'] for record in reopened.query('pay')] == ["row 2", "after crash"]
+    reopened.close()
+
+
+def test_record_missing_from_its_index_is_indexed_again(ledger_path):
+    index = ledger_path + ".transfer.idx" # row 5 is a transfer
+    os.truncate(index, os.path.getsize(index) - N.Ledger.INDEX.size)
+
+    ledger = N.Ledger(ledger_path)
+    assert [record['comment'] for record in ledger.query('transfer')] == ["row 1", "row 5"]
+    ledger.close()
+
+
+def test_index_rows_past_the_last_record_are_dropped(ledger_path):
+    os.truncate(ledger_path, 5 * N.Ledger.RECORD.size + 7) # the last record was torn
+
+    ledger = N.Ledger(ledger_path)
+    assert len(ledger) == 5
+    assert [record['comment'] for record in ledger.query('transfer')] == ["row 1"]
+    assert os.path.getsize(ledger_path + ".text") == sum(len(f"row {row}") for row in range(5))
+    ledger.close()
+
+
+def test_wallet_reopens_with_the_last_balance_after_a_crash(tmp_path):
+    path = str(tmp_path / "wallet.bin")
+    wallet = N.Wallet.open(path)
+    wallet.balance = 50000
+    wallet.pay(10000, comment="coffee")
+    balance, points = wallet.balance, wallet.points
+    wallet.ledger.close()
+    with open(path, 'ab') as f:
+        f.write(b"\xff" * 10)
+
+    reopened = N.Wallet.open(path)
+    assert (reopened.balance, reopened.points) == (balance, points)
+    reopened.ledger.close()
+
+
+def test_in_memory_history_stays_sorted_when_the_clock_goes_back(monkeypatch):
+    clock = iter([5, 3, 6])
+    monkeypatch.setattr(N.time, "time_ns", lambda: next(clock) * 10 ** 9)
+    wallet = N.Wallet()
+    for action in ("first", "second", "third"):
+        wallet.log_activity(action)
+    clock = iter([5, 3, 6])
+    for amount in (1000, 2000, 3000):
+        wallet.log_transaction('charge', amount, f"charge {amount}")
+    monkeypatch.undo()
+
+    assert [record['time_ns'] for record in wallet.activity_log] == [5 * 10 ** 9, 5 * 10 ** 9, 6 * 10 ** 9]
+    assert [record['action'] for record in wallet.history('activity', start=N.datetime.fromtimestamp(5))] == ["first", "second", "third"]
+    assert [record['comment'] for record in wallet.history('charge', end=N.datetime.fromtimestamp(6))] == ["charge 1000", "charge 2000"]
@@ -0,0 +1,109 @@
+import importlib.util
+import os
+import random
+import struct
+from pathlib import Path
+
+import pytest
+
+
+def load_naverpay():
+    path = Path(__file__).resolve().parent.parent / "Naverpay_Implement_Team_2.py"
+    spec = importlib.util.spec_from_file_location("Naverpay_Implement_Team_2", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+N = load_naverpay()
+
+
+def wallet_state(wallet):
+    return (wallet.balance, wallet.points, [dict(wallet.accounts[name]) for name in wallet.accounts],
+            {nickname: dict(wallet.receiver_saved[nickname]) for nickname in wallet.receiver_saved}, dict(wallet.gift_cards),
+            {kind: list(wallet._history(kind)) for kind in N.WalletSnapshot.HISTORIES})
+
+
+def busy_wallet():
+    wallet = N.Wallet(10000)
+    wallet.register_account("KB", "1234567", 500000)
+    wallet.save_receiver("mom", "Kim", "NH", "7654321")
+    wallet.register_gift_card("12345678", 3000)
+    wallet.charge(20000, "1", comment="top up")
+    wallet.pay(7000, comment="lunch", rng=random.Random(1))
+    return wallet
+
+
+def test_snapshot_and_checkpoints_restore_the_wallet(tmp_path):
+    path = str(tmp_path / "wallet.snap")
+    wallet = busy_wallet()
+    wallet.save_snapshot(path)
+    wallet.transfer(5000, "Kim", "NH", "7654321", comment="rent")
+    assert wallet.checkpoint() == 2 # the activity and the transfer comment
+    wallet.pay(3000, account_name="1", comment="coffee", rng=random.Random(2))
+    wallet.checkpoint()
+
+    restored = N.Wallet.restore(path)
+    assert wallet_state(restored) == wallet_state(wallet)
+    # the restored wallet continues the checkpoint chain
+    restored.charge(1000, "1", comment="more")
+    restored.checkpoint()
+    assert wallet_state(N.Wallet.restore(path)) == wallet_state(restored)
+
+
+def test_checkpoint_of_an_older_snapshot_is_ignored(tmp_path):
+    path = str(tmp_path / "wallet.snap")
+    wallet = busy_wallet()
+    wallet.save_snapshot(path)
+    wallet.pay(3000, comment="coffee", rng=random.Random(2))
+    wallet.checkpoint()
+    expected = wallet_state(wallet)
+    stale = open(path + ".1", 'rb').read()
+
+    # a crash between writing the new snapshot and removing the old checkpoints
+    wallet.charge(1000, "1", comment="more")
+    wallet.save_snapshot(path)
+    with open(path + ".1", 'wb') as f:
+        f.write(stale)
+    restored = N.Wallet.restore(path)
+    assert wallet_state(restored) == wallet_state(wallet) != expected
+
+
+@pytest.mark.parametrize("field, value, message", [(0, b'NOTSNAP\x00', "not a wallet snapshot"), (1, 99, "Unsupported wallet snapshot version 99")])
+def test_foreign_or_newer_snapshot_is_refused(tmp_path, field, value, message):
+    path = str(tmp_path / "wallet.snap")
+    busy_wallet().save_snapshot(path)
+    with open(path, 'r+b') as f:
+        header = list(N.WalletSnapshot.HEADER.unpack(f.read(N.WalletSnapshot.HEADER.size)))
+        header[field] = value
+        f.seek(0)
+        f.write(N.WalletSnapshot.HEADER.pack(*header))
+    with pytest.raises(ValueError, match=message):
+        N.Wallet.restore(path)
+
+
+def test_import_accounts_skips_registered_and_repeated_numbers():
+    wallet = N.Wallet()
+    wallet.register_account("KB", "1111111", 1000)
+    result = wallet.import_accounts([{'bank': "NH", 'number': "2222222", 'balance': "5000"},
+                                     {'bank': "IBK", 'number': "1111111"}, # already registered
+                                     {'bank': "SH", 'number': "2222222"}, # repeated in the rows
+                                     {'bank': "WR", 'number': "3333333", 'balance': "0"},
+                                     {'bank': "WR", 'number': "3333333"}])
+    assert result['imported'] == 2
+    assert [index for index, _ in result['errors']] == [1, 2, 3]
+    assert sorted(wallet.accounts.numbers()) == ["1111111", "2222222", "3333333"]
+    assert wallet.accounts[wallet.accounts.by_number("3333333")]['balance'] == wallet.INITIAL_ACCOUNT_BALANCE
+
+
+def test_import_gift_cards_skips_registered_and_repeated_numbers():
+    wallet = N.Wallet()
+    wallet.register_gift_card("11111111", 1000)
+    result = wallet.import_gift_cards([{'number': "22222222", 'balance': "5000"},
+                                       {'number': "11111111", 'balance': "300"},
+                                       {'number': "22222222", 'balance': "700"},
+                                       {'number': "33333333", 'balance': "200"}])
+    assert result['imported'] == 2
+    assert [index for index, _ in result['errors']] == [1, 2]
+    assert wallet.gift_cards == {"11111111": 1000, "22222222": 5000, "33333333": 200}
+    assert wallet.activity_log[-1]['action'] == "Registered 2 Gift Cards"
@@ -0,0 +1,48 @@
+import importlib.machinery
+import importlib.util
+import multiprocessing
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def load_transportation():
+    # Transportation은 확장자가 없는 스크립트라 SourceFileLoader로 직접 읽는다
+    path = Path(__file__).resolve().parent.parent / "Transportation"
+    loader = importlib.machinery.SourceFileLoader("Transportation", str(path))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[loader.name] = module
+    loader.exec_module(module)
+    return module
+
+
+T = load_transportation()
+
+
+@pytest.fixture
+def spawn_by_default(monkeypatch):
+    # 워커가 결과를 pickle할 때 찾는 모듈이 이 파일이 읽은 T여야 한다 (다른 테스트 파일도 같은 이름으로 다시 읽는다)
+    monkeypatch.setitem(sys.modules, "Transportation", T)
+    method = multiprocessing.get_start_method(allow_none=True)
+    multiprocessing.set_start_method('spawn', force=True)
+    yield
+    multiprocessing.set_start_method(method, force=True)
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason="replay workers need fork")
+def test_workers_match_one_process_whatever_the_default_start_method(tmp_path, spawn_by_default):
+    _, taps = T.generate_commuters(50, seed=3, days=1)
+    path = tmp_path / "taps.csv"
+    lines = ["user_id,age,balance,mode,name,trans_type,action,time,distance"]
+    for tap in taps:
+        if tap.vehicle != "bicycle":
+            lines.append(f"{tap.user_id},30,20000,{T.fare_mode(tap.vehicle)},{tap.vehicle.name},{tap.vehicle.trans_type},{tap.action},{tap.time.isoformat()},{tap.distance}")
+    lines.append("not,a,tap")
+    path.write_text("\n".join(lines) + "\n")
+
+    single = T.replay_taps(str(path), workers=1)
+    sharded = T.replay_taps(str(path), workers=3, chunk_size=16)
+    assert sharded == single
+    assert single.rejected >= 1
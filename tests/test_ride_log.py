@@ -0,0 +1,84 @@
+import importlib.machinery
+import importlib.util
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+
+def load_transportation():
+    # Transportation은 확장자가 없는 스크립트라 SourceFileLoader로 직접 읽는다
+    path = Path(__file__).resolve().parent.parent / "Transportation"
+    loader = importlib.machinery.SourceFileLoader("Transportation", str(path))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[loader.name] = module
+    loader.exec_module(module)
+    return module
+
+
+T = load_transportation()
+START = datetime(2024, 3, 4, 7)
+KST = timezone(timedelta(hours=9))
+
+
+def test_aware_times_survive_the_spill():
+    user = T.User(1, 30, T.TMoneyCard(100000))
+    bus, metro = T.Bus("100"), T.Metro("Line 2")
+    expected = []
+    for leg in range(6):
+        vehicle = (bus, metro)[leg % 2]
+        board = START.replace(tzinfo=KST if leg % 3 else timezone.utc) + timedelta(hours=leg)
+        T.FareSystem.process_ride(user, vehicle, user._t_money_card, "board", 0, board)
+        T.FareSystem.process_ride(user, vehicle, user._t_money_card, "alight", 12, board + timedelta(minutes=20))
+        expected += list(user.log)[-2:]
+    assert list(user.log) == expected
+    assert [entry[1].tzinfo for entry in user.log] == [entry[1].tzinfo for entry in expected]
+    assert user.balance() == 100000 - sum(entry[3] for entry in expected)
+
+
+def test_unloggable_tap_is_not_charged():
+    user = T.User(1, 30, T.TMoneyCard(100000))
+    bus = T.Bus("100")
+    with pytest.raises(ValueError):
+        T.FareSystem._charge_and_log(user, user._t_money_card, 1500, (bus, "07:00", "board", 1500, False))
+    assert user.balance() == 100000 and len(user.log) == 0
+
+
+def entries(count, vehicles=(T.Bus("100"), T.Metro("Line 2"), "bicycle")):
+    actions = ("board", "alight", "ride", "return")
+    return [(vehicles[index % len(vehicles)], START + timedelta(minutes=7 * index, microseconds=index), actions[index % 4], 100 * index, index % 3 == 0)
+            for index in range(count)]
+
+
+def test_spilled_entries_read_back_unchanged():
+    expected = entries(23)
+    log = T.RideLog(expected)
+    assert len(log) == 23
+    assert list(log) == expected
+    assert [log[index] for index in range(23)] == expected
+    assert log[0][0] is expected[0][0]
+
+
+def test_negative_and_slice_indexes():
+    expected = entries(11)
+    log = T.RideLog(expected)
+    assert log[-1] == expected[-1] and log[-11] == expected[0]
+    assert log[2:9:3] == expected[2:9:3]
+    assert log[-3:] == expected[-3:]
+    assert log[::-1] == expected[::-1]
+    with pytest.raises(IndexError):
+        log[11]
+    with pytest.raises(IndexError):
+        log[-12]
+
+
+@pytest.mark.parametrize("max_history", [0, 1, 3, 10])
+def test_max_history_keeps_at_least_the_newest_entries(max_history):
+    expected = entries(57)
+    log = T.RideLog(expected, max_history=max_history)
+    kept = list(log)
+    assert max(max_history, 1) <= len(kept) < max(2 * max_history, 5)
+    assert kept == expected[-len(kept):]
+    assert repr(log) == f"RideLog({len(kept)} entries, {57 - len(kept)} dropped)"
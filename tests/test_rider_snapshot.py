@@ -0,0 +1,118 @@
+import importlib.machinery
+import importlib.util
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+
+def load_transportation():
+    # Transportation은 확장자가 없는 스크립트라 SourceFileLoader로 직접 읽는다
+    path = Path(__file__).resolve().parent.parent / "Transportation"
+    loader = importlib.machinery.SourceFileLoader("Transportation", str(path))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[loader.name] = module
+    loader.exec_module(module)
+    return module
+
+
+T = load_transportation()
+START = datetime(2024, 3, 4, 7)
+
+
+def riders():
+    users = {user_id: T.User(user_id, age, T.TMoneyCard(50000)) for user_id, age in ((3, 30), (1, 15), (2, 70))}
+    users[1].update_bike_pass({'30day_1hour': START - timedelta(days=2)})
+    bus, express = T.Bus("100"), T.Bus("M5107", "express")
+    for user_id, vehicle in ((3, bus), (1, express)):
+        user = users[user_id]
+        T.FareSystem.process_ride(user, vehicle, user._t_money_card, "board", 0, START)
+        T.FareSystem.process_ride(user, vehicle, user._t_money_card, "alight", 40, START + timedelta(minutes=50))
+    T.FareSystem.process_ride(users[3], T.Metro("Line 2"), users[3]._t_money_card, "board", 0, START + timedelta(minutes=60))
+    return users
+
+
+def comparable(user):
+    # 다시 읽은 사용자는 교통수단 객체가 다르므로 이름표로 비교한다
+    user_id, age, balance, points, transfer_count, last, bike_pass = T.rider_state(user)
+    if last is not None:
+        last = (T.RiderSnapshot.vehicle_key(last[0]),) + last[1:]
+    return (user_id, age, balance, points, transfer_count, last, bike_pass)
+
+
+def states(store):
+    return {user_id: comparable(store[user_id]) for user_id in sorted(store)}
+
+
+def test_snapshot_round_trip_hydrates_the_same_riders(tmp_path):
+    path = str(tmp_path / "riders.snap")
+    users = riders()
+    expected = {user_id: comparable(user) for user_id, user in sorted(users.items())}
+    store = T.RiderStore(path)
+    for user_id, user in users.items():
+        store[user_id] = user
+    assert store.checkpoint() == 3 # 스냅샷이 없으면 전체 스냅샷
+    store.close()
+
+    reopened = T.RiderStore(path)
+    assert reopened.hydrated() == 0 and len(reopened) == 3
+    assert states(reopened) == expected
+    assert reopened[3].log[-1][4] # 환승 승차
+    reopened.close()
+
+
+def test_checkpoints_layer_over_the_snapshot(tmp_path):
+    path = str(tmp_path / "riders.snap")
+    store = T.RiderStore(path)
+    for user_id, user in riders().items():
+        store[user_id] = user
+    store.snapshot()
+    rider = store[2]
+    rider._t_money_card.charge(1000)
+    store[4] = T.User(4, 9, T.TMoneyCard(700))
+    assert store.checkpoint() == 2
+    expected = states(store)
+    store.close()
+
+    reopened = T.RiderStore(path)
+    assert states(reopened) == expected
+    assert reopened.checkpoint() == 0 # 바뀐 사용자가 없다
+    assert reopened.snapshot() == 4 and not os.path.exists(path + ".1")
+    reopened.close()
+    assert states(T.RiderStore(path)) == expected
+
+
+def test_checkpoint_of_an_older_snapshot_is_ignored(tmp_path):
+    path = str(tmp_path / "riders.snap")
+    store = T.RiderStore(path)
+    for user_id, user in riders().items():
+        store[user_id] = user
+    store.snapshot()
+    store[2]._t_money_card.charge(1000)
+    store.checkpoint()
+    store.close()
+
+    # 스냅샷을 다시 쓴 직후, 옛 체크포인트를 지우기 전에 멈춘 상황
+    snapshot = T.RiderSnapshot(path)
+    states_before = [snapshot.state(user_id) for user_id in snapshot.user_ids()]
+    snapshot.close()
+    T.RiderSnapshot.write(path, states_before)
+    reopened = T.RiderStore(path)
+    assert reopened[2].balance() == 50000
+    reopened.close()
+
+
+@pytest.mark.parametrize("field, value, message", [(0, b'NOTSNAP\x00', "not a rider snapshot"), (1, 99, "Unsupported rider snapshot version 99")])
+def test_foreign_or_newer_snapshot_is_refused(tmp_path, field, value, message):
+    path = str(tmp_path / "riders.snap")
+    T.RiderSnapshot.write(path, map(T.rider_state, riders().values()))
+    with open(path, 'r+b') as f:
+        header = list(T.RiderSnapshot.HEADER.unpack(f.read(T.RiderSnapshot.HEADER.size)))
+        header[field] = value
+        f.seek(0)
+        f.write(T.RiderSnapshot.HEADER.pack(*header))
+    with pytest.raises(ValueError, match=message):
+        T.RiderStore(path)
@@ -0,0 +1,42 @@
+import asyncio
+import importlib.machinery
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+
+def load_transportation():
+    # Transportation은 확장자가 없는 스크립트라 SourceFileLoader로 직접 읽는다
+    path = Path(__file__).resolve().parent.parent / "Transportation"
+    loader = importlib.machinery.SourceFileLoader("Transportation", str(path))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[loader.name] = module
+    loader.exec_module(module)
+    return module
+
+
+T = load_transportation()
+TAP = {'user_id': 1, 'age': 30, 'balance': 10000, 'mode': 'bus', 'name': '100', 'action': 'board', 'time': '2024-03-04T07:00:00'}
+
+
+async def exchange(lines):
+    gateway = T.TapGateway(workers=1)
+    host, port = await gateway.listen_tcp()
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        # 한 번에 보내 파이프라이닝된 상태로 처리되게 한다
+        writer.write(b"".join(line + b"\n" for line in lines))
+        await writer.drain()
+        return [json.loads(await asyncio.wait_for(reader.readline(), 5)) for _ in lines]
+    finally:
+        writer.close()
+        await gateway.close()
+
+
+def test_non_object_json_is_rejected_and_the_next_tap_still_answered():
+    replies = asyncio.run(exchange([b"5", b"[1]", b'"tap"', json.dumps(TAP).encode()]))
+    assert all('error' in reply for reply in replies[:3])
+    assert 'error' not in replies[3]
+    assert replies[3]['fare'] == 1500